@@ -6,7 +6,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import sqlite3
 from datetime import datetime
-from lifelines import KaplanMeierFitter, CoxPHFitter
+from lifelines import CoxPHFitter
 from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder, StandardScaler
@@ -15,9 +15,29 @@ import logging
 from contextlib import contextmanager
 import os
 import io
+import queue
 import plotly.express as px
+import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import xlsxwriter
 import time
-from functools import wraps
+import atexit
+import threading
+import hashlib
+from functools import wraps, lru_cache
+from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from numba import njit, prange
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+try:
+    # Optional: reads the table straight into Arrow buffers
+    from adbc_driver_sqlite import dbapi as adbc_sqlite
+except ImportError:
+    adbc_sqlite = None
 
 # Configure logging
 logging.basicConfig(
@@ -30,45 +50,273 @@ logger = logging.getLogger(__name__)
 DB_PATH = "resume_data.db"
 TABLE_NAME = "resume_data"
 
+# Insertable columns in schema order; one statement text keeps SQLite's statement cache warm
+INSERT_COLS = (
+    'Age', 'Sex', 'Employment_Status', 'Income_Level', 'Social_Deprivation',
+    'Material_Deprivation', 'Healthcare_Role', 'Department', 'Years_Experience',
+    'Weekly_Hours', 'Night_Shifts_Monthly', 'Overtime_Hours_Monthly', 'Patient_Facing',
+    'Management_Responsibilities', 'Work_Stress_Level', 'Job_Satisfaction',
+    'Workplace_Support', 'Burnout_Level', 'Sick_Days_Last_Year', 'Workplace_Incidents',
+    'Recent_Promotion', 'Recent_Demotion', 'MH_Disorders', 'Substance_Use_Disorders',
+    'History_Suicidal_Ideation', 'Previous_Suicide_Attempts', 'Frequency_Suicidal_Thoughts',
+    'Intensity_Suicidal_Thoughts', 'Chronic_Illnesses', 'GP_Visits', 'ED_Visits',
+    'Hospitalizations', 'Hopelessness', 'Despair', 'Impulsivity', 'Aggression',
+    'Access_Lethal_Means', 'Social_Isolation', 'Coping_Strategies', 'Measured_Resilience',
+    'MH_Service_Engagement', 'Supportive_Relationships', 'Suicidal_Distress',
+    'Time_To_Crisis', 'Crisis_Event', 'Observation_Date',
+)
+INSERT_SQL = (
+    f"INSERT INTO {TABLE_NAME} ({', '.join(INSERT_COLS)}) "
+    f"VALUES ({', '.join('?' * len(INSERT_COLS))})"
+)
+UPSERT_COLS = ('id',) + INSERT_COLS
+
+# SQLite tuning applied once to the shared connection
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=memory",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Read-only connections used by the data loaders
+RO_POOL_SIZE = 4
+READER_PRAGMAS = (
+    "PRAGMA query_only=1",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Raised by ADBC when a column holds values of more than one storage class
+ADBC_TYPE_MISMATCH = "Type mismatch"
+
+# Full-text search index over the free-text and categorical columns
+SEARCH_TABLE = "resume_fts"
+SEARCH_COLS = (
+    'Sex', 'Employment_Status', 'Income_Level', 'Healthcare_Role', 'Department',
+    'Patient_Facing', 'Management_Responsibilities', 'Recent_Promotion',
+    'Recent_Demotion', 'MH_Disorders', 'Substance_Use_Disorders', 'Chronic_Illnesses',
+)
+# The trigram tokenizer cannot match terms shorter than this
+MIN_INDEXED_TERM = 3
+
+# Multiselect answers stored comma-joined in the main table, normalized into one tag row each
+TAGS_TABLE = "entry_tags"
+TAG_CATEGORIES = {
+    'MH_Disorders': 'mh',
+    'Substance_Use_Disorders': 'substance',
+    'Chronic_Illnesses': 'chronic',
+}
+TAG_INSERT_SQL = f"INSERT INTO {TAGS_TABLE} (entry_id, category, tag) VALUES (?, ?, ?)"
+TAG_DELETE_SQL = f"DELETE FROM {TAGS_TABLE} WHERE entry_id = ? AND category = ?"
+
+# Tables smaller than this are filtered in memory rather than in SQL
+IN_MEMORY_FILTER_LIMIT = 10_000
+
+# Rows rendered in the front-page results table
+DISPLAY_ROW_LIMIT = 500
+
+# Narrow storage types for the survey fields
+COLUMN_DTYPES = {
+    'Age': 'uint8',
+    'Social_Deprivation': 'uint8',
+    'Material_Deprivation': 'uint8',
+    'Years_Experience': 'uint8',
+    'Weekly_Hours': 'uint8',
+    'Night_Shifts_Monthly': 'uint8',
+    'Overtime_Hours_Monthly': 'int16',
+    'Work_Stress_Level': 'uint8',
+    'Job_Satisfaction': 'uint8',
+    'Workplace_Support': 'uint8',
+    'Burnout_Level': 'uint8',
+    'Sick_Days_Last_Year': 'int16',
+    'Workplace_Incidents': 'uint8',
+    'History_Suicidal_Ideation': 'uint8',
+    'Previous_Suicide_Attempts': 'uint8',
+    'Frequency_Suicidal_Thoughts': 'uint8',
+    'Intensity_Suicidal_Thoughts': 'uint8',
+    'GP_Visits': 'uint8',
+    'ED_Visits': 'uint8',
+    'Hospitalizations': 'uint8',
+    'Hopelessness': 'uint8',
+    'Despair': 'uint8',
+    'Impulsivity': 'uint8',
+    'Aggression': 'uint8',
+    'Access_Lethal_Means': 'uint8',
+    'Social_Isolation': 'uint8',
+    'Coping_Strategies': 'uint8',
+    'Measured_Resilience': 'uint8',
+    'MH_Service_Engagement': 'uint8',
+    'Supportive_Relationships': 'uint8',
+    'Suicidal_Distress': 'uint8',
+    'Time_To_Crisis': 'float32',
+    'Crisis_Event': 'uint8',
+}
+
+# Low-cardinality text columns held as pandas categoricals
+CATEGORICAL_COLS = ('Sex', 'Employment_Status', 'Healthcare_Role', 'Department')
+
+# Columns needed by each analytical view
+DASHBOARD_COLS = ('Crisis_Event', 'Time_To_Crisis')
+COX_COLS = ('Time_To_Crisis', 'Crisis_Event', 'Age', 'Work_Stress_Level',
+            'Burnout_Level', 'Social_Isolation')
+ML_COLS = ('Age', 'Work_Stress_Level', 'Burnout_Level', 'Social_Isolation',
+           'Hopelessness', 'Despair', 'Crisis_Event')
+
+# Native XGBoost training setup for the crisis-event model
+XGB_PARAMS = {
+    'objective': 'binary:logistic',
+    'eval_metric': 'logloss',
+    'tree_method': 'hist',
+    'max_bin': 256,
+    'eta': 0.1,
+    'nthread': os.cpu_count(),
+    'seed': 42,
+}
+XGB_NUM_BOOST_ROUND = 1000
+XGB_MIN_BOOST_ROUND = 100
+XGB_EARLY_STOPPING_ROUNDS = 50
+XGB_CV_FOLDS = 5
+
+# Number of features shown in the SHAP summary
+SHAP_TOP_K = 8
+
+# Weights of the composite risk score derived for the ML model
+RISK_COMPOSITE_WEIGHTS = {
+    'Work_Stress_Level': 0.4,
+    'Burnout_Level': 0.4,
+    'Social_Isolation': 0.2,
+}
+
 # Performance monitoring decorator
+PERF_LOG_SIZE = 256
+
 def monitor_performance(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        start_time = time.perf_counter()
         result = func(*args, **kwargs)
-        execution_time = time.time() - start_time
+        execution_time = time.perf_counter() - start_time
         
-        if 'performance_metrics' not in st.session_state:
-            st.session_state.performance_metrics = {}
+        # One deque per session, appended in place so no state key is rewritten
+        if 'perf_log' not in st.session_state:
+            st.session_state.perf_log = deque(maxlen=PERF_LOG_SIZE)
         
-        st.session_state.performance_metrics[func.__name__] = execution_time
+        st.session_state.perf_log.append((func.__name__, execution_time))
         return result
     return wrapper
 
+def performance_summary() -> pd.DataFrame:
+    """Aggregate the recorded timings per function"""
+    log = list(st.session_state.get('perf_log', ()))
+    if not log:
+        return pd.DataFrame(columns=['calls', 'mean_s', 'max_s', 'last_s'])
+    timings = pd.DataFrame(log, columns=['function', 'seconds'])
+    summary = timings.groupby('function')['seconds'].agg(
+        calls='count', mean_s='mean', max_s='max', last_s='last'
+    )
+    return summary.sort_values('max_s', ascending=False)
+
 @contextmanager
 def get_db_connection():
-    conn = None
+    """Run a block on the shared write connection inside one transaction"""
+    conn = get_conn()
+    # Sessions share the connection, so only one of them may hold a transaction
+    with _get_write_lock():
+        # The shared connection is in autocommit mode, so group the block's
+        # statements into one transaction unless the caller already opened one
+        owns_transaction = not conn.in_transaction
+        if owns_transaction:
+            conn.execute("BEGIN")
+        try:
+            yield conn
+            if owns_transaction and conn.in_transaction:
+                conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if owns_transaction and conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.error(f"Database connection error: {e}")
+            st.error("An unexpected error occurred. Please check the logs.")
+            raise
+        except Exception:
+            if owns_transaction and conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+@st.cache_resource
+def get_conn() -> sqlite3.Connection:
+    """Open the long-lived read/write connection shared by every session"""
+    # Autocommit mode: transactions are opened explicitly with BEGIN/COMMIT
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    atexit.register(conn.close)
+    return conn
+
+@st.cache_resource
+def _get_write_lock() -> threading.RLock:
+    """Serializes transactions on the shared connection; reentrant for nested helpers"""
+    return threading.RLock()
+
+@st.cache_resource
+def _get_ro_pool() -> queue.Queue:
+    """Open a small pool of read-only connections shared by all sessions"""
+    pool = queue.Queue()
+    for _ in range(RO_POOL_SIZE):
+        conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True, check_same_thread=False)
+        for pragma in READER_PRAGMAS:
+            conn.execute(pragma)
+        atexit.register(conn.close)
+        pool.put(conn)
+    return pool
+
+@contextmanager
+def get_read_connection():
+    """Borrow a read-only connection from the pool"""
+    pool = _get_ro_pool()
+    conn = pool.get()
     try:
-        conn = sqlite3.connect(DB_PATH)
         yield conn
-    except sqlite3.Error as e:
-        logger.error(f"Database connection error: {e}")
-        st.error("An unexpected error occurred. Please check the logs.")
-        raise
     finally:
-        if conn:
-            conn.close()
+        pool.put(conn)
+
+@st.cache_resource
+def _get_version_probe() -> tuple[sqlite3.Connection, threading.Lock]:
+    """Dedicated read-only connection for polling PRAGMA data_version"""
+    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True, check_same_thread=False)
+    atexit.register(conn.close)
+    return conn, threading.Lock()
+
+@st.cache_resource
+def _get_adbc_conn() -> tuple:
+    """Long-lived read-only ADBC connection for the Arrow loader; None without the driver"""
+    if adbc_sqlite is None:
+        return None, None
+    # Autocommit, so each read sees the latest commit instead of one long-held snapshot
+    conn = adbc_sqlite.connect(f"file:{DB_PATH}?mode=ro", autocommit=True)
+    with conn.cursor() as cursor:
+        for pragma in READER_PRAGMAS:
+            cursor.execute(pragma)
+    atexit.register(conn.close)
+    return conn, threading.Lock()
+
+def db_data_version() -> int:
+    """Counter that moves whenever any other connection commits to the database"""
+    # data_version is only comparable on a single connection, hence the probe
+    conn, lock = _get_version_probe()
+    with lock:
+        return conn.execute("PRAGMA data_version").fetchone()[0]
 
 def validate_entry_data(data: dict) -> tuple[bool, str]:
     try:
-        # Basic validation checks
-        if data['Age'] < 18 or data['Age'] > 100:
-            return False, "Age must be between 18 and 100"
-        
+        # Basic validation checks; required fields first, so a blank row gets a clear message
         required_fields = ['Age', 'Sex', 'Employment_Status', 'Healthcare_Role']
         for field in required_fields:
             if not data.get(field):
                 return False, f"{field} is required"
+        
+        if data['Age'] < 18 or data['Age'] > 100:
+            return False, "Age must be between 18 and 100"
                 
         return True, ""
     except Exception as e:
@@ -153,61 +401,526 @@ def create_database():
         st.error(f"Database creation error: {e}")
         logger.error(f"Database creation error: {e}")
 
+def _coerce_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply the column types the analytics expect to a freshly read frame"""
+    # Convert timestamp columns
+    if 'Observation_Date' in df.columns:
+        df['Observation_Date'] = pd.to_datetime(df['Observation_Date'])
+    
+    # Downcast survey fields; missing or out-of-range values fall back to float32
+    for col, dtype in COLUMN_DTYPES.items():
+        if col not in df.columns or not pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        if np.issubdtype(np.dtype(dtype), np.integer) and not _fits_integer(df[col], dtype):
+            dtype = 'float32'
+        df[col] = df[col].astype(dtype, copy=False)
+    
+    # Dictionary-encode the low-cardinality text columns
+    categorical = {col: 'category' for col in CATEGORICAL_COLS if col in df.columns}
+    if categorical:
+        df = df.astype(categorical)
+    
+    return df
+
+def _is_text_column(values: pd.Series) -> bool:
+    """Text columns may be object, Arrow-backed string or categorical"""
+    return (
+        pd.api.types.is_object_dtype(values)
+        or pd.api.types.is_string_dtype(values)
+        or isinstance(values.dtype, pd.CategoricalDtype)
+    )
+
+def _fits_integer(values: pd.Series, dtype: str) -> bool:
+    """Whether values can be stored in the integer dtype without loss"""
+    info = np.iinfo(dtype)
+    return bool(
+        values.notna().all()
+        and values.min() >= info.min
+        and values.max() <= info.max
+    )
+
+def _create_search_index(conn, rebuild: bool = False):
+    """Create the external-content FTS5 table and the triggers that keep it in sync"""
+    cols = ', '.join(SEARCH_COLS)
+    new_values = ', '.join(f"new.{col}" for col in SEARCH_COLS)
+    old_values = ', '.join(f"old.{col}" for col in SEARCH_COLS)
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (SEARCH_TABLE,)
+    ).fetchone()
+    
+    # Plain execute calls, so the statements join the caller's transaction;
+    # executescript would commit whatever the caller had pending first
+    statements = (
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+            {cols}, content='{TABLE_NAME}', content_rowid='id', tokenize='trigram'
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON {TABLE_NAME} BEGIN
+            INSERT INTO {SEARCH_TABLE}(rowid, {cols}) VALUES (new.id, {new_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON {TABLE_NAME} BEGIN
+            INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, {cols})
+            VALUES ('delete', old.id, {old_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE ON {TABLE_NAME} BEGIN
+            INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, {cols})
+            VALUES ('delete', old.id, {old_values});
+            INSERT INTO {SEARCH_TABLE}(rowid, {cols}) VALUES (new.id, {new_values});
+        END""",
+    )
+    for statement in statements:
+        conn.execute(statement)
+    
+    # Index the rows that were written before the index existed
+    if rebuild or not exists:
+        conn.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')")
+
+def _create_indexes(conn):
+    """Secondary indexes for the ordered and filtered reads"""
+    conn.execute(
+        f"CREATE INDEX IF NOT EXISTS idx_obs_date ON {TABLE_NAME}(Observation_Date DESC)"
+    )
+
+def _split_tags(value) -> list[str]:
+    """Individual answers of a comma-joined multiselect value"""
+    if not value:
+        return []
+    tags = (tag.strip() for tag in str(value).split(','))
+    return [tag for tag in tags if tag and tag != 'None']
+
+def _tag_rows(entry_id: int, data: dict) -> list[tuple]:
+    return [
+        (entry_id, category, tag)
+        for col, category in TAG_CATEGORIES.items()
+        for tag in _split_tags(data.get(col))
+    ]
+
+def _insert_tags(conn, entry_ids: list[int], rows: list[dict]):
+    """Replace the tags of the given entries with the ones in their row data"""
+    # Only categories whose column is present are replaced; the others are left alone
+    categories = [cat for col, cat in TAG_CATEGORIES.items() if any(col in data for data in rows)]
+    conn.executemany(TAG_DELETE_SQL, [(i, cat) for i in entry_ids for cat in categories])
+    conn.executemany(
+        TAG_INSERT_SQL,
+        [tag for entry_id, data in zip(entry_ids, rows) for tag in _tag_rows(entry_id, data)]
+    )
+
+def _rebuild_tags(conn):
+    """Regenerate every tag row from the comma-joined columns"""
+    cols = list(TAG_CATEGORIES)
+    rows = conn.execute(f"SELECT id, {', '.join(cols)} FROM {TABLE_NAME}").fetchall()
+    conn.execute(f"DELETE FROM {TAGS_TABLE}")
+    _insert_tags(conn, [row[0] for row in rows], [dict(zip(cols, row[1:])) for row in rows])
+
+def _create_tag_table(conn, rebuild: bool = False):
+    """Create the entry_tags junction table and backfill it on first use"""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (TAGS_TABLE,)
+    ).fetchone()
+    
+    # Executed one by one inside the caller's transaction, as in _create_search_index
+    statements = (
+        f"""CREATE TABLE IF NOT EXISTS {TAGS_TABLE} (
+            entry_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            tag TEXT NOT NULL
+        )""",
+        f"CREATE INDEX IF NOT EXISTS idx_tags ON {TAGS_TABLE}(category, tag)",
+        f"CREATE INDEX IF NOT EXISTS idx_tags_entry ON {TAGS_TABLE}(entry_id)",
+        f"""CREATE TRIGGER IF NOT EXISTS {TAGS_TABLE}_ad AFTER DELETE ON {TABLE_NAME} BEGIN
+            DELETE FROM {TAGS_TABLE} WHERE entry_id = old.id;
+        END""",
+    )
+    for statement in statements:
+        conn.execute(statement)
+    
+    if rebuild or not exists:
+        _rebuild_tags(conn)
+
+@st.cache_resource
+def ensure_schema():
+    """Add the indexes to databases created before they existed; runs once per process"""
+    try:
+        with get_db_connection() as conn:
+            _create_indexes(conn)
+            _create_search_index(conn)
+            _create_tag_table(conn)
+    except sqlite3.Error as e:
+        logger.error(f"Schema upgrade error: {e}")
+
+def search_entry_ids(search_term: str) -> list[int]:
+    """Ids of entries whose text columns contain the term, via the trigram index"""
+    # A quoted FTS5 string is matched literally as a substring
+    phrase = '"' + search_term.replace('"', '""') + '"'
+    with get_read_connection() as conn:
+        rows = conn.execute(
+            f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH ?", (phrase,)
+        ).fetchall()
+    return [row[0] for row in rows]
+
+def tagged_entry_ids(category: str, tags: list[str]) -> list[int]:
+    """Ids of entries carrying any of the tags, via idx_tags"""
+    with get_read_connection() as conn:
+        rows = conn.execute(
+            f"SELECT DISTINCT entry_id FROM {TAGS_TABLE} "
+            f"WHERE category = ? AND tag IN ({', '.join('?' * len(tags))})",
+            (category, *tags)
+        ).fetchall()
+    return [row[0] for row in rows]
+
 @st.cache_data(ttl=3600)
+def load_tag_levels() -> dict[str, list[str]]:
+    """Distinct tags per category, for the filter widgets"""
+    try:
+        with get_read_connection() as conn:
+            rows = conn.execute(
+                f"SELECT DISTINCT category, tag FROM {TAGS_TABLE} ORDER BY category, tag"
+            ).fetchall()
+    except sqlite3.Error as e:
+        logger.error(f"Tag loading error: {e}")
+        return {}
+    levels = {}
+    for category, tag in rows:
+        levels.setdefault(category, []).append(tag)
+    return levels
+
+def _read_table_arrow(query: str) -> pd.DataFrame | None:
+    """Run a query through ADBC into an Arrow-backed frame; None when unavailable"""
+    conn, lock = _get_adbc_conn()
+    if conn is None:
+        return None
+    try:
+        with lock, conn.cursor() as cursor:
+            cursor.execute(query)
+            return cursor.fetch_arrow_table().to_pandas(types_mapper=pd.ArrowDtype)
+    except OSError as e:
+        # ADBC infers column types from the first rows and rejects mixed columns
+        if ADBC_TYPE_MISMATCH not in str(e):
+            raise
+        logger.warning(f"ADBC read failed, falling back to sqlite3: {e}")
+        return None
+
+@st.cache_data(ttl=60, max_entries=1, show_spinner=False)
 def load_data():
     try:
-        with get_db_connection() as conn:
-            query = f"SELECT * FROM {TABLE_NAME}"
-            df = pd.read_sql_query(query, conn)
-            
-            # Convert timestamp columns
-            if 'Observation_Date' in df.columns:
-                df['Observation_Date'] = pd.to_datetime(df['Observation_Date'])
-            
-            # Convert numeric columns
-            numeric_columns = df.select_dtypes(include=['int64', 'float64']).columns
-            for col in numeric_columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            return df
+        query = f"SELECT * FROM {TABLE_NAME}"
+        df = _read_table_arrow(query)
+        if df is None:
+            with get_read_connection() as conn:
+                df = pd.read_sql_query(query, conn, dtype_backend='pyarrow')
+        return _coerce_types(df)
+    except Exception as e:
+        logger.error(f"Data loading error: {e}")
+        return pd.DataFrame()
+
+@st.cache_data(ttl=3600)
+def load_filter_levels() -> dict[str, list]:
+    """Levels of the categorical columns, for the filter widgets, read with DISTINCT in SQLite"""
+    levels = {}
+    try:
+        with get_read_connection() as conn:
+            table_cols = {name for name, _ in _table_columns(conn)}
+            for col in CATEGORICAL_COLS:
+                if col not in table_cols:
+                    continue
+                levels[col] = [value for (value,) in conn.execute(
+                    f'SELECT DISTINCT "{col}" FROM {TABLE_NAME} WHERE "{col}" IS NOT NULL ORDER BY 1'
+                )]
+    except sqlite3.Error as e:
+        logger.error(f"Filter level loading error: {e}")
+    return levels
+
+@st.cache_data(ttl=3600)
+def _load_columns(cols: tuple) -> pd.DataFrame:
+    """Load only the given columns; cached per column tuple"""
+    try:
+        with get_read_connection() as conn:
+            query = f"SELECT {', '.join(cols)} FROM {TABLE_NAME}"
+            df = pd.read_sql_query(query, conn, dtype_backend='pyarrow')
+            return _coerce_types(df)
     except Exception as e:
         logger.error(f"Data loading error: {e}")
         return pd.DataFrame()
 
+def load_dashboard_view() -> pd.DataFrame:
+    return _load_columns(DASHBOARD_COLS)
 
-@monitor_performance
-def insert_entry(data: dict):
+def load_cox_view() -> pd.DataFrame:
+    return _load_columns(COX_COLS)
+
+def load_ml_view() -> pd.DataFrame:
+    return _load_columns(ML_COLS)
+
+def get_latest_entries(limit: int) -> pd.DataFrame:
+    """Fetch the latest entries from the database."""
+    try:
+        # Walks idx_obs_date backwards and stops after `limit` rows
+        with get_read_connection() as conn:
+            query = f"SELECT * FROM {TABLE_NAME} ORDER BY Observation_Date DESC LIMIT ?"
+            cursor = conn.execute(query, (limit,))
+            return pd.DataFrame.from_records(
+                cursor.fetchall(), columns=[d[0] for d in cursor.description]
+            )
+    except Exception as e:
+        logger.error(f"Error fetching latest entries: {e}")
+        return pd.DataFrame()
+
+@st.cache_data(ttl=3600)
+def dashboard_aggregates() -> dict:
+    """Headline counts for the dashboard, aggregated inside SQLite"""
     try:
-        # Validate data before insertion
+        with get_read_connection() as conn:
+            total, crisis_events, age_min, age_max = conn.execute(
+                f"SELECT COUNT(*), SUM(Crisis_Event), MIN(Age), MAX(Age) FROM {TABLE_NAME}"
+            ).fetchone()
+            employment = conn.execute(
+                f"SELECT Employment_Status, COUNT(*) AS n FROM {TABLE_NAME} "
+                "WHERE Employment_Status IS NOT NULL "
+                "GROUP BY Employment_Status ORDER BY n DESC"
+            ).fetchall()
+    except sqlite3.Error as e:
+        logger.error(f"Dashboard aggregate error: {e}")
+        return {}
+    return {
+        'total': total,
+        'crisis_events': crisis_events or 0,
+        'age_min': age_min,
+        'age_max': age_max,
+        'employment_counts': pd.Series(
+            [n for _, n in employment],
+            index=[status for status, _ in employment],
+            name='count'
+        ),
+    }
+
+def load_all_views() -> tuple:
+    """Fill the full frame, the analytical views and the dashboard aggregates concurrently"""
+    loaders = (load_data, load_dashboard_view, load_cox_view, load_ml_view, dashboard_aggregates)
+    # Workers share this run's context so st.cache_data works inside them
+    with ThreadPoolExecutor(
+        max_workers=len(loaders),
+        initializer=add_script_run_ctx,
+        initargs=(None, get_script_run_ctx())
+    ) as executor:
+        futures = [executor.submit(loader) for loader in loaders]
+        return tuple(future.result() for future in futures)
+
+def _table_columns(conn) -> list[tuple[str, str]]:
+    """(name, declared type) for every column of the table"""
+    return [(name, col_type) for _, name, col_type, *_ in conn.execute(f"PRAGMA table_info({TABLE_NAME})")]
+
+# Keyed on db_data_version(), so reruns are cache hits until a write lands
+@st.cache_data(max_entries=2, show_spinner=False)
+def get_table_summary(version: int) -> dict:
+    """Row count, last observation and row-level quality counts, aggregated in SQLite"""
+    with get_read_connection() as conn:
+        cols = [f'"{name}"' for name, _ in _table_columns(conn)]
+        any_null = ' OR '.join(f"{c} IS NULL" for c in cols)
+        rows, last_update, complete = conn.execute(
+            f"SELECT COUNT(*), MAX(Observation_Date), SUM(NOT ({any_null})) FROM {TABLE_NAME}"
+        ).fetchone()
+    return {
+        'rows': rows,
+        'columns': len(cols),
+        'last_update': last_update,
+        'complete_rows': complete or 0,
+    }
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def count_duplicate_rows(version: int) -> int:
+    """Rows identical to another row in every column; sorts the whole table, so run on request"""
+    # The unique id would make every row distinct, so only the entry columns are compared
+    cols = ', '.join(f'"{name}"' for name in INSERT_COLS)
+    with get_read_connection() as conn:
+        rows, distinct = conn.execute(
+            f"SELECT (SELECT COUNT(*) FROM {TABLE_NAME}), "
+            f"(SELECT COUNT(*) FROM (SELECT DISTINCT {cols} FROM {TABLE_NAME}))"
+        ).fetchone()
+    return rows - distinct
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def get_column_stats(version: int) -> pd.DataFrame:
+    """Declared type, distinct and missing counts for every column in one scan"""
+    with get_read_connection() as conn:
+        table_cols = _table_columns(conn)
+        exprs = ', '.join(
+            f'COUNT(DISTINCT "{name}"), SUM("{name}" IS NULL)' for name, _ in table_cols
+        )
+        values = conn.execute(f"SELECT {exprs} FROM {TABLE_NAME}").fetchone()
+    return pd.DataFrame({
+        'Column': [name for name, _ in table_cols],
+        'Data Type': [col_type for _, col_type in table_cols],
+        'Unique Values': values[0::2],
+        'Missing Values': [missing or 0 for missing in values[1::2]],
+    })
+
+def invalidate_data_caches():
+    """Drop every cached read of the table after a write"""
+    for cached in (load_data, _load_columns, load_filter_levels, load_tag_levels,
+                   dashboard_aggregates, get_table_summary, get_column_stats,
+                   count_duplicate_rows):
+        cached.clear()
+
+@st.cache_data(ttl=3600)
+def get_text_columns() -> list[str]:
+    """Searchable TEXT columns, read from the table definition"""
+    with get_read_connection() as conn:
+        table_info = conn.execute(f"PRAGMA table_info({TABLE_NAME})").fetchall()
+    return [
+        name for _, name, col_type, *_ in table_info
+        if col_type.upper() == 'TEXT' and name != 'Observation_Date'
+    ]
+
+@st.cache_data(ttl=3600)
+def get_column_names() -> list[str]:
+    """Every column of the table, read from the table definition"""
+    with get_read_connection() as conn:
+        return [name for name, _ in _table_columns(conn)]
+
+@monitor_performance
+def query_filtered(search_term, filter_vars) -> pd.DataFrame:
+    """Run the front-page filters as a parameterized query in SQLite"""
+    clauses = []
+    params = []
+    
+    # Case-insensitive substring search across all text columns
+    if search_term and len(search_term) >= MIN_INDEXED_TERM:
+        clauses.append(
+            f"id IN (SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH ?)"
+        )
+        params.append('"' + search_term.replace('"', '""') + '"')
+    elif search_term:
+        escaped = search_term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        text_columns = get_text_columns()
+        clauses.append(
+            "(" + " OR ".join(f"{col} LIKE ? ESCAPE '\\'" for col in text_columns) + ")"
+        )
+        params.extend([f"%{escaped}%"] * len(text_columns))
+    
+    if 'age_range' in filter_vars:
+        clauses.append("Age BETWEEN ? AND ?")
+        params.extend(filter_vars['age_range'])
+    
+    if 'selected_genders' in filter_vars:
+        genders = filter_vars['selected_genders']
+        clauses.append(f"Sex IN ({', '.join(['?' for _ in genders])})")
+        params.extend(genders)
+    
+    if filter_vars.get('selected_mh'):
+        tags = filter_vars['selected_mh']
+        clauses.append(
+            f"id IN (SELECT entry_id FROM {TAGS_TABLE} "
+            f"WHERE category = 'mh' AND tag IN ({', '.join(['?' for _ in tags])}))"
+        )
+        params.extend(tags)
+    
+    query = f"SELECT * FROM {TABLE_NAME}"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    
+    with get_read_connection() as conn:
+        df = pd.read_sql_query(query, conn, params=params, dtype_backend='pyarrow')
+    return _coerce_types(df)
+
+
+def _insert_rows(conn, rows: list[dict]):
+    """Insert entries and their tags; the caller owns the transaction"""
+    cursor = conn.cursor()
+    # Columns missing from a row are stored as NULL
+    cursor.executemany(INSERT_SQL, [tuple(row.get(c) for c in INSERT_COLS) for row in rows])
+    # AUTOINCREMENT ids of one uninterrupted batch are consecutive
+    last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+    _insert_tags(conn, list(range(last_id - len(rows) + 1, last_id + 1)), rows)
+
+@monitor_performance
+def insert_entries(rows: list[dict]) -> bool:
+    """Insert several entries in a single transaction"""
+    if not rows:
+        return True
+
+    # Validate every row before anything is written
+    for data in rows:
         is_valid, error_message = validate_entry_data(data)
         if not is_valid:
             st.error(f"Validation error: {error_message}")
             return False
-            
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            columns = ', '.join(data.keys())
-            placeholders = ', '.join(['?' for _ in data])
-            query = f"INSERT INTO {TABLE_NAME} ({columns}) VALUES ({placeholders})"
-            cursor.execute(query, list(data.values()))
-            conn.commit()
-            return True
-    except sqlite3.Error as e:
-        logger.error(f"Database error: {e}")
-        st.error(f"⚠️ Failed to save data: {e}")
-        return False
 
-def safe_export_data(df: pd.DataFrame, format: str) -> tuple[bool, str]:
+    conn = get_conn()
+    with _get_write_lock():
+        try:
+            conn.execute("BEGIN")
+            _insert_rows(conn, rows)
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.error(f"Database error: {e}")
+            st.error(f"⚠️ Failed to save data: {e}")
+            return False
+    invalidate_data_caches()
+    return True
+
+@monitor_performance
+def insert_entry(data: dict):
+    return insert_entries([data])
+
+def _array_digest(arr: np.ndarray) -> str:
+    """Full content hash of an array, used to key cached resources"""
+    digest = hashlib.md5(np.ascontiguousarray(arr).tobytes())
+    digest.update(f"{arr.shape}{arr.dtype}".encode())
+    return digest.hexdigest()
+
+def _frame_digest(df: pd.DataFrame) -> str:
+    """Full content hash of a DataFrame, used to key cached resources"""
+    digest = hashlib.md5(pd.util.hash_pandas_object(df, index=True).values)
+    digest.update(str(list(df.columns)).encode())
+    return digest.hexdigest()
+
+EXPORT_CHUNK_ROWS = 1000
+
+def _csv_bytes(df: pd.DataFrame) -> bytes:
+    """Encode a frame as CSV with the Arrow writer"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type):
+            # Whole seconds in the file; the unsafe cast truncates sub-second values instead of raising
+            seconds = pc.cast(table.column(i), pa.timestamp('s', field.type.tz), safe=False)
+            table = table.set_column(i, field.name, seconds)
+    buffer = io.BytesIO()
+    pa_csv.write_csv(table, buffer)
+    return buffer.getvalue()
+
+def _excel_bytes(df: pd.DataFrame) -> bytes:
+    """Stream a frame into an xlsx workbook row by row"""
+    buffer = io.BytesIO()
+    # No 'in_memory' here: it silently overrides constant_memory
+    workbook = xlsxwriter.Workbook(buffer, {
+        'constant_memory': True,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss'
+    })
+    worksheet = workbook.add_worksheet()
+    worksheet.write_row(0, 0, [str(col) for col in df.columns])
+    # constant_memory flushes each row once the next one starts, so cells
+    # have to be written in row order (pandas' to_excel goes column by column)
+    for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+        chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS]
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        for offset, row in enumerate(chunk.itertuples(index=False, name=None)):
+            worksheet.write_row(start + offset + 1, 0, row)
+    workbook.close()
+    return buffer.getvalue()
+
+EXPORT_WRITERS = {"CSV": _csv_bytes, "Excel": _excel_bytes}
+
+# Keyed on content, so re-exporting the same selection reuses the encoded file
+@st.cache_data(max_entries=4, show_spinner=False, hash_funcs={pd.DataFrame: _frame_digest})
+def _export_bytes(df: pd.DataFrame, format: str) -> bytes:
+    return EXPORT_WRITERS[format](df)
+
+def safe_export_data(df: pd.DataFrame, format: str) -> tuple[bool, bytes | str]:
     try:
-        if format == "CSV":
-            return True, df.to_csv(index=False)
-        elif format == "Excel":
-            buffer = io.BytesIO()
-            with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-                df.to_excel(writer, index=False)
-            return True, buffer.getvalue()
-        else:
+        if format not in EXPORT_WRITERS:
             return False, "Unsupported format"
+        return True, _export_bytes(df, format)
     except Exception as e:
         return False, str(e)
 
@@ -228,14 +941,19 @@ def main():
     # Create database if it doesn't exist
     if not os.path.exists(DB_PATH):
         create_database()
+
+    # Switch the database to WAL before the read-only pool attaches
+    get_conn()
+    ensure_schema()
     
     # Load data with error handling
     try:
-        df = load_data()
+        df, df_dash, df_cox, df_ml, dash_stats = load_all_views()
     except Exception as e:
         logger.error(f"Error loading data: {e}")
         st.error("Failed to load data. Please check the database connection.")
-        df = pd.DataFrame()
+        df = df_dash = df_cox = df_ml = pd.DataFrame()
+        dash_stats = {}
     
     # Sidebar
     st.sidebar.header("🧭 Main Menu")
@@ -254,7 +972,7 @@ def main():
     # Dashboard Tab
     with tab1:
         try:
-            display_dashboard(df)
+            display_dashboard(dash_stats, df_dash, df_cox, df_ml)
         except Exception as e:
             logger.error(f"Dashboard error: {e}")
             st.error("Error displaying dashboard. Please check the logs.")
@@ -280,7 +998,7 @@ def main():
 
     # Database Front Tab
     with tab3:
-        display_database_front(df)
+        display_database_front()
 
     # Detailed Analytics Tab
     with tab4:
@@ -294,12 +1012,19 @@ def main():
 
     # Database Backend Tab
     with tab6:
-        display_database_backend(edit_mode)
+        display_database_backend(edit_mode, df)
+
+    # Timings are only aggregated when someone asks for them
+    if st.sidebar.checkbox("Show Performance Log", value=False):
+        with st.sidebar.expander("⏱️ Performance", expanded=True):
+            st.dataframe(performance_summary().style.format({
+                'mean_s': '{:.3f}', 'max_s': '{:.3f}', 'last_s': '{:.3f}'
+            }))
 
 
 
 @monitor_performance
-def display_dashboard(df):
+def display_dashboard(stats, df, df_cox, df_ml):
     st.title("🧠 RESUME Predictive Modelling Dashboard")
     
     # Add analysis choice selection in the dashboard
@@ -324,31 +1049,30 @@ def display_dashboard(df):
     - Employment status may influence risk factors
     """)
     
-    if not df.empty:
+    if stats.get('total'):
         # Overview metrics with explanations
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Records", len(df))
+            st.metric("Total Records", stats['total'])
             st.markdown("*Total number of healthcare workers in database*")
         
         with col2:
-            crisis_events = df['Crisis_Event'].sum() if 'Crisis_Event' in df.columns else 0
-            st.metric("Recorded Crisis Events", int(crisis_events))
+            st.metric("Recorded Crisis Events", int(stats['crisis_events']))
             st.markdown("*Number of documented crisis incidents*")
         
         with col3:
-            if 'Age' in df.columns:
-                age_range = f"{int(df['Age'].min())} - {int(df['Age'].max())}"
+            if stats['age_min'] is not None:
+                age_range = f"{int(stats['age_min'])} - {int(stats['age_max'])}"
                 st.metric("Age Range", age_range)
                 st.markdown("*Age span of healthcare workers*")
             else:
                 st.metric("Age Range", "N/A")
                 st.markdown("*Age data not available*")
         
+        employment_counts = stats['employment_counts']
         with col4:
-            if 'Employment_Status' in df.columns:
-                employment_counts = df['Employment_Status'].value_counts()
+            if not employment_counts.empty:
                 st.metric("Employment Types", len(employment_counts))
                 st.markdown("*Different categories of employment*")
             else:
@@ -358,13 +1082,14 @@ def display_dashboard(df):
         try:
             # Employment Distribution
             st.subheader("👥 Employment Distribution")
-            if 'Employment_Status' in df.columns:
-                emp_fig = px.pie(df, names='Employment_Status', 
+            if not employment_counts.empty:
+                emp_fig = px.pie(values=employment_counts.values, 
+                               names=employment_counts.index,
                                title='Distribution by Employment Status')
                 st.plotly_chart(emp_fig)
             
             # Risk Analysis Section
-            display_risk_analysis(df, analysis_choice)
+            display_risk_analysis(df, analysis_choice, df_cox, df_ml)
             
         except Exception as e:
             logger.error(f"Error in dashboard visualization: {e}")
@@ -373,7 +1098,7 @@ def display_dashboard(df):
         st.info("No data available. Please add entries using the Data Entry tab.")
 
 @monitor_performance
-def display_risk_analysis(df, analysis_choice):
+def display_risk_analysis(df, analysis_choice, df_cox, df_ml):
     st.header("🎯 Risk Analysis Overview")
     st.markdown("""
     ### Understanding the Risk Models:
@@ -398,22 +1123,55 @@ def display_risk_analysis(df, analysis_choice):
         if analysis_choice == "Kaplan–Meier Estimator":
             display_kaplan_meier_analysis(df)
         elif analysis_choice == "Cox Proportional Hazards Model":
-            display_cox_analysis(df)
+            display_cox_analysis(df_cox)
         elif analysis_choice == "Machine Learning (XGBoost)":
-            display_ml_analysis(df)
+            display_ml_analysis(df_ml)
     except Exception as e:
         logger.error(f"Error in risk analysis: {e}")
         st.error("Error performing risk analysis. Please check the data format.")
 
+@njit(cache=True)
+def _kaplan_meier(times, events):
+    """Product-limit survival estimate at each distinct observed time"""
+    order = np.argsort(times, kind='mergesort')
+    t = times[order]
+    e = events[order]
+    n = t.shape[0]
+    out_t = np.empty(n + 1, dtype=np.float64)
+    out_s = np.empty(n + 1, dtype=np.float64)
+    out_t[0] = 0.0
+    out_s[0] = 1.0
+    at_risk = n
+    survival = 1.0
+    m = 1
+    i = 0
+    while i < n:
+        j = i
+        deaths = 0
+        while j < n and t[j] == t[i]:
+            deaths += e[j]
+            j += 1
+        survival *= 1.0 - deaths / at_risk
+        at_risk -= j - i
+        out_t[m] = t[i]
+        out_s[m] = survival
+        m += 1
+        i = j
+    return out_t[:m], out_s[:m]
+
 @monitor_performance
 def display_kaplan_meier_analysis(df):
     if 'Time_To_Crisis' in df.columns and 'Crisis_Event' in df.columns:
-        kmf = KaplanMeierFitter()
-        kmf.fit(df['Time_To_Crisis'], 
-               df['Crisis_Event'], 
-               label='Overall')
+        km_data = df[['Time_To_Crisis', 'Crisis_Event']].dropna()
+        times, survival = _kaplan_meier(
+            km_data['Time_To_Crisis'].to_numpy(np.float64),
+            km_data['Crisis_Event'].to_numpy(np.int8)
+        )
         fig, ax = plt.subplots(figsize=(10, 6))
-        kmf.plot(ax=ax)
+        ax.step(times, survival, where='post', label='Overall')
+        ax.set_xlabel('Time_To_Crisis')
+        ax.set_ylim(0, 1.05)
+        ax.legend()
         plt.title('Kaplan-Meier Survival Curve')
         st.pyplot(fig)
     else:
@@ -424,16 +1182,13 @@ def display_cox_analysis(df):
     try:
         if all(col in df.columns for col in ['Time_To_Crisis', 'Crisis_Event']):
             # Prepare data for Cox analysis
-            cph = CoxPHFitter()
             covariates = ['Age', 'Work_Stress_Level', 'Burnout_Level', 'Social_Isolation']
             
             # Filter required columns and handle missing values
             cox_data = df[['Time_To_Crisis', 'Crisis_Event'] + covariates].dropna()
             
             if len(cox_data) > 0:
-                cph.fit(cox_data, 
-                       duration_col='Time_To_Crisis',
-                       event_col='Crisis_Event')
+                cph = _fit_cox(cox_data)
                 
                 # Display results
                 st.subheader("Cox Proportional Hazards Analysis")
@@ -451,6 +1206,60 @@ def display_cox_analysis(df):
         logger.error(f"Error in Cox analysis: {e}")
         st.error("Error performing Cox analysis. Please check the data format.")
 
+@st.cache_resource(hash_funcs={np.ndarray: _array_digest})
+def _fit_xgb(X: np.ndarray, y: np.ndarray, feature_cols: tuple) -> xgb.Booster:
+    """Train the crisis-event booster on the whole training split.
+
+    The round count comes from early-stopped cross-validation, floored at
+    XGB_MIN_BOOST_ROUND so a noisy fold can't collapse the model to a stump.
+    """
+    dtrain = xgb.DMatrix(X, label=y, feature_names=list(feature_cols))
+    cv_results = xgb.cv(
+        XGB_PARAMS,
+        dtrain,
+        num_boost_round=XGB_NUM_BOOST_ROUND,
+        nfold=XGB_CV_FOLDS,
+        stratified=True,
+        early_stopping_rounds=XGB_EARLY_STOPPING_ROUNDS,
+        seed=XGB_PARAMS['seed']
+    )
+    num_rounds = max(len(cv_results), XGB_MIN_BOOST_ROUND)
+    return xgb.train(XGB_PARAMS, dtrain, num_boost_round=num_rounds)
+
+@st.cache_resource(hash_funcs={pd.DataFrame: _frame_digest})
+def _fit_cox(cox_data: pd.DataFrame) -> CoxPHFitter:
+    cph = CoxPHFitter()
+    cph.fit(cox_data,
+           duration_col='Time_To_Crisis',
+           event_col='Crisis_Event')
+    return cph
+
+# Boosters come from the _fit_xgb cache, so object identity is a stable key
+@st.cache_resource(hash_funcs={xgb.Booster: id})
+def _shap_explainer(booster: xgb.Booster) -> shap.TreeExplainer:
+    return shap.TreeExplainer(booster)
+
+@st.cache_data(hash_funcs={xgb.Booster: id, np.ndarray: _array_digest})
+def _shap_values(booster: xgb.Booster, X: np.ndarray) -> np.ndarray:
+    return _shap_explainer(booster).shap_values(X)
+
+# fastmath without 'nnan', otherwise LLVM may drop the NaN checks
+@njit(parallel=True, cache=True, fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'})
+def _impute_and_score(X, col_means, weights):
+    """Fill NaNs with column means and append a weighted composite score column"""
+    n, k = X.shape
+    out = np.empty((n, k + 1), dtype=np.float32)
+    for i in prange(n):
+        score = np.float32(0.0)
+        for j in range(k):
+            value = X[i, j]
+            if np.isnan(value):
+                value = col_means[j]
+            out[i, j] = value
+            score += weights[j] * value
+        out[i, k] = score
+    return out
+
 @monitor_performance
 def display_ml_analysis(df):
     try:
@@ -460,7 +1269,18 @@ def display_ml_analysis(df):
         
         if all(col in df.columns for col in feature_cols + ['Crisis_Event']):
             # Prepare data
-            X = df[feature_cols].fillna(df[feature_cols].mean())
+            X_raw = np.ascontiguousarray(df[feature_cols].to_numpy(np.float32))
+            col_means = np.nanmean(X_raw, axis=0).astype(np.float32)
+            weights = np.array(
+                [RISK_COMPOSITE_WEIGHTS.get(col, 0.0) for col in feature_cols],
+                dtype=np.float32
+            )
+            feature_cols = feature_cols + ['Risk_Composite']
+            X = pd.DataFrame(
+                _impute_and_score(X_raw, col_means, weights),
+                columns=feature_cols,
+                index=df.index
+            )
             y = df['Crisis_Event']
             
             # Split data
@@ -468,14 +1288,22 @@ def display_ml_analysis(df):
                 X, y, test_size=0.2, random_state=42
             )
             
-            # Train XGBoost model
-            model = xgb.XGBClassifier(random_state=42)
-            model.fit(X_train, y_train)
+            # Train XGBoost model (cached until the data changes)
+            booster = _fit_xgb(
+                X_train.to_numpy(np.float32),
+                y_train.to_numpy(np.float32),
+                tuple(feature_cols)
+            )
+            dtest = xgb.DMatrix(X_test.to_numpy(np.float32), feature_names=feature_cols)
             
-            # Calculate feature importance
+            # Calculate feature importance (normalized gain)
+            gain = booster.get_score(importance_type='gain')
+            importance = np.array([gain.get(col, 0.0) for col in feature_cols])
+            if importance.sum() > 0:
+                importance = importance / importance.sum()
             feature_importance = pd.DataFrame({
                 'feature': feature_cols,
-                'importance': model.feature_importances_
+                'importance': importance
             }).sort_values('importance', ascending=False)
             
             # Display results
@@ -489,39 +1317,50 @@ def display_ml_analysis(df):
             st.plotly_chart(fig)
             
             # Model performance
-            y_pred = model.predict_proba(X_test)[:, 1]
+            y_pred = booster.predict(dtest)
             auc_score = roc_auc_score(y_test, y_pred)
             st.metric("Model AUC-ROC Score", f"{auc_score:.3f}")
             
             # Add SHAP analysis
             st.subheader("SHAP Analysis")
             try:
-                # Calculate SHAP values
-                explainer = shap.TreeExplainer(model)
-                shap_values = explainer.shap_values(X_test)
+                # Calculate SHAP values (cached until the model or data changes)
+                explainer = _shap_explainer(booster)
+                X_test_values = X_test.to_numpy(np.float32)
+                shap_values = _shap_values(booster, X_test_values)
                 
-                # Create SHAP summary plot
-                fig, ax = plt.subplots(figsize=(10, 6))
-                shap.summary_plot(shap_values, X_test, feature_names=feature_cols, show=False)
-                st.pyplot(fig)
-                plt.close()
+                # Mean |SHAP| for the most influential features
+                mean_abs = np.abs(shap_values).mean(0)
+                top = np.argsort(mean_abs)[-SHAP_TOP_K:]
+                fig = px.bar(
+                    x=mean_abs[top],
+                    y=[feature_cols[i] for i in top],
+                    orientation='h',
+                    labels={'x': 'Mean |SHAP value|', 'y': 'Feature'},
+                    title='Mean |SHAP|'
+                )
+                st.plotly_chart(fig)
                 
-                # SHAP force plot for a sample case
+                # SHAP waterfall for a sample case
                 st.subheader("Sample Case Analysis")
                 sample_idx = 0  # First test case
                 st.markdown("SHAP values for a sample case:")
                 
-                # Convert SHAP values to HTML
-                shap_html = shap.force_plot(
-                    explainer.expected_value,
-                    shap_values[sample_idx,:],
-                    X_test.iloc[sample_idx,:],
-                    feature_names=feature_cols,
-                    matplotlib=True,
-                    show=False
+                base_value = float(np.ravel(explainer.expected_value)[0])
+                contributions = shap_values[sample_idx, :]
+                order = np.argsort(np.abs(contributions))[::-1]
+                fig = go.Figure(go.Waterfall(
+                    orientation='h',
+                    base=base_value,
+                    measure=['relative'] * len(order),
+                    y=[f"{feature_cols[i]} = {X_test_values[sample_idx, i]:.2f}" for i in order],
+                    x=contributions[order]
+                ))
+                fig.update_layout(
+                    title=f"Contributions from the base value {base_value:.3f} (log-odds)",
+                    yaxis={'autorange': 'reversed'}
                 )
-                plt.close()
-                st.pyplot(shap_html)
+                st.plotly_chart(fig)
                 
             except Exception as e:
                 logger.error(f"SHAP analysis error: {e}")
@@ -534,10 +1373,14 @@ def display_ml_analysis(df):
         st.error("Error performing ML analysis. Please check the data format.")
 
 @monitor_performance
-def display_database_front(df):
+def display_database_front():
     st.title("📊 Database Overview")
 
-    if not df.empty:
+    # Decided on the SQL row count, so a large table is never loaded for this tab
+    total_rows = get_table_summary(db_data_version())['rows']
+    if total_rows:
+        columns = get_column_names()
+        stats = dashboard_aggregates()
         st.header("🔍 Search and Filter")
         
         # Search functionality
@@ -546,50 +1389,61 @@ def display_database_front(df):
             search_term = st.text_input("Search across all fields:", "")
         
         # Advanced filtering options
+        levels = load_filter_levels()
         with st.expander("Advanced Filters"):
             filter_col1, filter_col2, filter_col3 = st.columns(3)
             
             with filter_col1:
                 # Demographic filters
                 st.subheader("Demographics")
-                if 'Age' in df.columns:
+                # A slider needs two distinct bounds, so skip it until ages differ
+                age_min, age_max = stats.get('age_min'), stats.get('age_max')
+                if age_min is not None and age_max is not None and age_min < age_max:
                     age_range = st.slider("Age Range", 
-                                        int(df['Age'].min()), 
-                                        int(df['Age'].max()), 
-                                        (int(df['Age'].min()), int(df['Age'].max())))
+                                        int(age_min), 
+                                        int(age_max), 
+                                        (int(age_min), int(age_max)))
                 
-                if 'Sex' in df.columns:
+                if 'Sex' in levels:
                     selected_genders = st.multiselect(
                         "Gender", 
-                        df['Sex'].unique().tolist(),
-                        default=df['Sex'].unique().tolist()
+                        levels['Sex'],
+                        default=levels['Sex']
                     )
             
             with filter_col2:
                 # Occupational filters
                 st.subheader("Occupation")
-                if 'Healthcare_Role' in df.columns:
+                if 'Healthcare_Role' in levels:
                     selected_roles = st.multiselect(
                         "Healthcare Role", 
-                        df['Healthcare_Role'].unique().tolist(),
-                        default=df['Healthcare_Role'].unique().tolist()
+                        levels['Healthcare_Role'],
+                        default=levels['Healthcare_Role']
                     )
                 
-                if 'Department' in df.columns:
+                if 'Department' in levels:
                     selected_departments = st.multiselect(
                         "Department", 
-                        df['Department'].unique().tolist(),
-                        default=df['Department'].unique().tolist()
+                        levels['Department'],
+                        default=levels['Department']
                     )
             
             with filter_col3:
                 # Risk filters
                 st.subheader("Risk Factors")
-                if 'Suicidal_Distress' in df.columns:
+                if 'Suicidal_Distress' in columns:
                     risk_level = st.slider("Suicidal Distress Level", 
                                          0, 10, (0, 10))
                 
-                if 'Crisis_Event' in df.columns:
+                mh_levels = load_tag_levels().get('mh')
+                if mh_levels:
+                    selected_mh = st.multiselect(
+                        "Mental Health Disorders",
+                        mh_levels,
+                        help="Show entries reporting any of the selected disorders"
+                    )
+                
+                if 'Crisis_Event' in columns:
                     crisis_filter = st.multiselect(
                         "Crisis Events", 
                         [0, 1],
@@ -599,113 +1453,59 @@ def display_database_front(df):
         
         # Apply filters
         try:
-            filtered_df = apply_filters(df, search_term, locals())
-            display_filtered_results(filtered_df, df)
+            if total_rows < IN_MEMORY_FILTER_LIMIT:
+                filtered_df = apply_filters(load_data(), search_term, locals())
+            else:
+                filtered_df = query_filtered(search_term, locals())
+            display_filtered_results(filtered_df, total_rows)
         except Exception as e:
             logger.error(f"Error in filtering: {e}")
             st.error("Error applying filters. Please check your selection.")
     else:
         st.info("No data available. Please add entries using the Data Entry tab.")
 
+def _text_match_mask(values: pd.Series, needle: str) -> np.ndarray:
+    """Case-insensitive substring test over one text column; missing values never match"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Test each level once and broadcast through the integer codes
+        levels = np.asarray(values.cat.categories.astype(str), dtype=str)
+        level_hits = np.char.find(np.char.lower(levels), needle) >= 0
+        codes = values.cat.codes.to_numpy()
+        return (codes >= 0) & level_hits[codes]
+    present = values.notna().to_numpy()
+    text = np.asarray(values.to_numpy(dtype=object, na_value=''), dtype=str)
+    return present & (np.char.find(np.char.lower(text), needle) >= 0)
+
 @monitor_performance
 def apply_filters(df, search_term, filter_vars):
-    filtered_df = df.copy()
+    # Every filter narrows one boolean mask; the frame is indexed once at the end
+    mask = np.ones(len(df), dtype=bool)
     
     # Text search across all string columns
-    if search_term:
-        mask = pd.Series(False, index=filtered_df.index)
-        for col in filtered_df.select_dtypes(include=['object']).columns:
-            mask = mask | filtered_df[col].astype(str).str.contains(search_term, case=False, na=False)
-        filtered_df = filtered_df[mask]
+    if search_term and len(search_term) >= MIN_INDEXED_TERM and 'id' in df.columns:
+        mask &= df['id'].isin(search_entry_ids(search_term)).to_numpy()
+    elif search_term:
+        needle = search_term.lower()
+        hits = np.zeros(len(df), dtype=bool)
+        for col in [c for c in df.columns if _is_text_column(df[c])]:
+            hits |= _text_match_mask(df[col], needle)
+        mask &= hits
     
     # Apply other filters if they exist in the filter_vars
     if 'age_range' in filter_vars:
-        filtered_df = filtered_df[
-            (filtered_df['Age'] >= filter_vars['age_range'][0]) & 
-            (filtered_df['Age'] <= filter_vars['age_range'][1])
-        ]
+        ages = df['Age'].to_numpy(dtype=np.float64, na_value=np.nan)
+        lo, hi = filter_vars['age_range']
+        mask &= (ages >= lo) & (ages <= hi)
     
     if 'selected_genders' in filter_vars:
-        filtered_df = filtered_df[filtered_df['Sex'].isin(filter_vars['selected_genders'])]
-    
-    # Add more filters as needed
-    
-    return filtered_df
-
-@monitor_performance
-def display_filtered_results(filtered_df, df):
-    st.markdown(f"**Showing {len(filtered_df)} of {len(df)} records**")
+        mask &= df['Sex'].isin(filter_vars['selected_genders']).to_numpy()
     
-    # Column selection
-    st.subheader("📋 Select Columns to Display")
-    all_columns = filtered_df.columns.tolist()
-    default_columns = [
-        "Observation_Date", "Age", "Sex", "Employment_Status",
-        "Healthcare_Role", "Department", "Suicidal_Distress", 
-        "Time_To_Crisis", "Crisis_Event"
-    ]
-    selected_columns = st.multiselect(
-        "Choose columns:",
-        all_columns,
-        default=[col for col in default_columns if col in all_columns]
-    )
+    if filter_vars.get('selected_mh') and 'id' in df.columns:
+        mask &= df['id'].isin(tagged_entry_ids('mh', filter_vars['selected_mh'])).to_numpy()
     
-    # Display filtered data
-    if selected_columns:
-        st.dataframe(
-            filtered_df[selected_columns].sort_values(
-                "Observation_Date", 
-                ascending=False
-            )
-        )
-    else:
-        st.warning("Please select at least one column to display")
-    
-    # Export options
-    export_data(filtered_df, selected_columns)
-
-@monitor_performance
-def export_data(df, selected_columns):
-    st.subheader("📤 Export Filtered Data")
-    export_format = st.radio(
-        "Export Format:", 
-        ["CSV", "Excel", "JSON"], 
-        horizontal=True
-    )
+    # Add more filters as needed
     
-    if st.button("Export Data"):
-        try:
-            export_df = df[selected_columns] if selected_columns else df
-            
-            if export_format == "CSV":
-                csv = export_df.to_csv(index=False)
-                st.download_button(
-                    label="Download CSV",
-                    data=csv,
-                    file_name="resume_filtered_data.csv",
-                    mime="text/csv"
-                )
-            elif export_format == "Excel":
-                buffer = io.BytesIO()
-                with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-                    export_df.to_excel(writer, index=False)
-                st.download_button(
-                    label="Download Excel",
-                    data=buffer.getvalue(),
-                    file_name="resume_filtered_data.xlsx",
-                    mime="application/vnd.ms-excel"
-                )
-            else:  # JSON
-                json_data = export_df.to_json(orient="records")
-                st.download_button(
-                    label="Download JSON",
-                    data=json_data,
-                    file_name="resume_filtered_data.json",
-                    mime="application/json"
-                )
-        except Exception as e:
-            logger.error(f"Export error: {e}")
-            st.error(f"Error exporting data: {e}")
+    return df if mask.all() else df[mask]
 
 @monitor_performance
 def display_visualizations(df, selected_columns):
@@ -722,21 +1522,21 @@ def display_visualizations(df, selected_columns):
         if chart_type in ["Bar Chart", "Pie Chart"]:
             category_col = st.selectbox(
                 "Category Column", 
-                [col for col in selected_columns if df[col].dtype == 'object']
+                [col for col in selected_columns if _is_text_column(df[col])]
             )
         elif chart_type == "Histogram":
             numeric_col = st.selectbox(
                 "Numeric Column", 
-                [col for col in selected_columns if df[col].dtype in ['int64', 'float64']]
+                [col for col in selected_columns if pd.api.types.is_numeric_dtype(df[col])]
             )
         else:  # Box Plot
             numeric_col = st.selectbox(
                 "Numeric Column", 
-                [col for col in selected_columns if df[col].dtype in ['int64', 'float64']]
+                [col for col in selected_columns if pd.api.types.is_numeric_dtype(df[col])]
             )
             category_col = st.selectbox(
                 "Group By", 
-                [col for col in selected_columns if df[col].dtype == 'object']
+                [col for col in selected_columns if _is_text_column(df[col])]
             )
     
     try:
@@ -774,19 +1574,41 @@ def display_visualizations(df, selected_columns):
         logger.error(f"Visualization error: {e}")
         st.error("Error generating visualization. Please check your selection.")
 
+@st.cache_data(ttl=3600, hash_funcs={pd.DataFrame: _frame_digest})
+def _column_profile(df: pd.DataFrame) -> pd.DataFrame:
+    """Missing and unique counts per column, in a single pass over each column"""
+    names, dtypes, missing, unique = [], [], [], []
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series):
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            nulls = np.isnan(values)
+            n_unique = np.unique(values[~nulls]).size
+        else:
+            values = series.to_numpy(dtype=object)
+            nulls = pd.isna(values)
+            n_unique = len(dict.fromkeys(values[~nulls]))
+        names.append(col)
+        dtypes.append(str(series.dtype))
+        missing.append(int(nulls.sum()))
+        unique.append(n_unique)
+    
+    missing = np.array(missing, dtype=np.int64)
+    return pd.DataFrame({
+        'Column': names,
+        'Data Type': dtypes,
+        'Missing Values': missing,
+        'Missing Percentage': missing / max(len(df), 1) * 100,
+        'Unique Values': unique
+    })
+
 @monitor_performance
 def display_data_quality_metrics(df):
     st.header("🔍 Data Quality Overview")
     
     # Missing data analysis
-    missing_data = df.isnull().sum()
-    missing_pct = (missing_data / len(df)) * 100
-    
-    quality_metrics = pd.DataFrame({
-        'Column': missing_data.index,
-        'Missing Values': missing_data.values,
-        'Missing Percentage': missing_pct.values
-    })
+    profile = _column_profile(df)
+    quality_metrics = profile[['Column', 'Missing Values', 'Missing Percentage']]
     
     # Display metrics
     st.dataframe(quality_metrics[quality_metrics['Missing Values'] > 0])
@@ -805,15 +1627,44 @@ def display_data_quality_metrics(df):
     
     # Data type information
     st.subheader("📊 Column Data Types")
-    dtype_df = pd.DataFrame({
-        'Column': df.dtypes.index,
-        'Data Type': df.dtypes.values,
-        'Unique Values': df.nunique().values
-    })
-    dtype_df['Data Type'] = dtype_df['Data Type'].astype(str)  # Convert dtype objects to strings
-    st.dataframe(dtype_df)
-
-
+    st.dataframe(profile[['Column', 'Data Type', 'Unique Values']])
+
+
+
+@dataclass
+class EntryForm:
+    """Values of the data entry form widgets"""
+    age: int
+    sex: str
+    employment_status: str
+    income_level: str
+    social_deprivation: int
+    material_deprivation: int
+    healthcare_role: str
+    department: str
+    years_experience: int
+    weekly_hours: int
+    night_shifts: int
+    work_stress: int
+    job_satisfaction: int
+    patient_facing: str
+    mh_disorders: list[str]
+    substance_use: list[str]
+    suicidal_ideation: str
+    previous_attempts: int
+    chronic_illnesses: list[str]
+    gp_visits: int
+    ed_visits: int
+    hospitalizations: int
+    hopelessness: int
+    despair: int
+    impulsivity: int
+    aggression: int
+    access_lethal_means: int
+    social_isolation: int
+    suicidal_distress: int
+    time_to_crisis: int
+    crisis_event: str
 
 @monitor_performance
 def display_data_entry_form():
@@ -1002,7 +1853,40 @@ def display_data_entry_form():
         if submitted:
             try:
                 # Prepare data for insertion
-                entry_data = prepare_entry_data(locals())
+                form = EntryForm(
+                    age=age,
+                    sex=sex,
+                    employment_status=employment_status,
+                    income_level=income_level,
+                    social_deprivation=social_deprivation,
+                    material_deprivation=material_deprivation,
+                    healthcare_role=healthcare_role,
+                    department=department,
+                    years_experience=years_experience,
+                    weekly_hours=weekly_hours,
+                    night_shifts=night_shifts,
+                    work_stress=work_stress,
+                    job_satisfaction=job_satisfaction,
+                    patient_facing=patient_facing,
+                    mh_disorders=mh_disorders,
+                    substance_use=substance_use,
+                    suicidal_ideation=suicidal_ideation,
+                    previous_attempts=previous_attempts,
+                    chronic_illnesses=chronic_illnesses,
+                    gp_visits=gp_visits,
+                    ed_visits=ed_visits,
+                    hospitalizations=hospitalizations,
+                    hopelessness=hopelessness,
+                    despair=despair,
+                    impulsivity=impulsivity,
+                    aggression=aggression,
+                    access_lethal_means=access_lethal_means,
+                    social_isolation=social_isolation,
+                    suicidal_distress=suicidal_distress,
+                    time_to_crisis=time_to_crisis,
+                    crisis_event=crisis_event,
+                )
+                entry_data = prepare_entry_data(form)
                 
                 # Validate and insert data
                 if insert_entry(entry_data):
@@ -1014,40 +1898,40 @@ def display_data_entry_form():
                 st.error(f"Error saving data: {e}")
 
 @monitor_performance
-def prepare_entry_data(form_data):
+def prepare_entry_data(form: EntryForm) -> dict:
     """Prepare form data for database insertion"""
     entry_data = {
-        "Age": form_data.get('age'),
-        "Sex": form_data.get('sex'),
-        "Employment_Status": form_data.get('employment_status'),
-        "Income_Level": form_data.get('income_level'),
-        "Social_Deprivation": form_data.get('social_deprivation'),
-        "Material_Deprivation": form_data.get('material_deprivation'),
-        "Healthcare_Role": form_data.get('healthcare_role'),
-        "Department": form_data.get('department'),
-        "Years_Experience": form_data.get('years_experience'),
-        "Weekly_Hours": form_data.get('weekly_hours'),
-        "Night_Shifts_Monthly": form_data.get('night_shifts'),
-        "Work_Stress_Level": form_data.get('work_stress'),
-        "Job_Satisfaction": form_data.get('job_satisfaction'),
-        "Patient_Facing": form_data.get('patient_facing'),
-        "MH_Disorders": ','.join(form_data.get('mh_disorders', [])),
-        "Substance_Use_Disorders": ','.join(form_data.get('substance_use', [])),
-        "History_Suicidal_Ideation": 1 if form_data.get('suicidal_ideation') == "Yes" else 0,
-        "Previous_Suicide_Attempts": form_data.get('previous_attempts'),
-        "Chronic_Illnesses": ','.join(form_data.get('chronic_illnesses', [])),
-        "GP_Visits": form_data.get('gp_visits'),
-        "ED_Visits": form_data.get('ed_visits'),
-        "Hospitalizations": form_data.get('hospitalizations'),
-        "Hopelessness": form_data.get('hopelessness'),
-        "Despair": form_data.get('despair'),
-        "Impulsivity": form_data.get('impulsivity'),
-        "Aggression": form_data.get('aggression'),
-        "Access_Lethal_Means": form_data.get('access_lethal_means'),
-        "Social_Isolation": form_data.get('social_isolation'),
-        "Suicidal_Distress": form_data.get('suicidal_distress'),
-        "Time_To_Crisis": form_data.get('time_to_crisis'),
-        "Crisis_Event": 1 if form_data.get('crisis_event') == "Yes" else 0,
+        "Age": form.age,
+        "Sex": form.sex,
+        "Employment_Status": form.employment_status,
+        "Income_Level": form.income_level,
+        "Social_Deprivation": form.social_deprivation,
+        "Material_Deprivation": form.material_deprivation,
+        "Healthcare_Role": form.healthcare_role,
+        "Department": form.department,
+        "Years_Experience": form.years_experience,
+        "Weekly_Hours": form.weekly_hours,
+        "Night_Shifts_Monthly": form.night_shifts,
+        "Work_Stress_Level": form.work_stress,
+        "Job_Satisfaction": form.job_satisfaction,
+        "Patient_Facing": form.patient_facing,
+        "MH_Disorders": ','.join(form.mh_disorders),
+        "Substance_Use_Disorders": ','.join(form.substance_use),
+        "History_Suicidal_Ideation": 1 if form.suicidal_ideation == "Yes" else 0,
+        "Previous_Suicide_Attempts": form.previous_attempts,
+        "Chronic_Illnesses": ','.join(form.chronic_illnesses),
+        "GP_Visits": form.gp_visits,
+        "ED_Visits": form.ed_visits,
+        "Hospitalizations": form.hospitalizations,
+        "Hopelessness": form.hopelessness,
+        "Despair": form.despair,
+        "Impulsivity": form.impulsivity,
+        "Aggression": form.aggression,
+        "Access_Lethal_Means": form.access_lethal_means,
+        "Social_Isolation": form.social_isolation,
+        "Suicidal_Distress": form.suicidal_distress,
+        "Time_To_Crisis": form.time_to_crisis,
+        "Crisis_Event": 1 if form.crisis_event == "Yes" else 0,
         "Observation_Date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
     
@@ -1055,7 +1939,7 @@ def prepare_entry_data(form_data):
 
 
 @monitor_performance
-def display_database_backend(edit_mode):
+def display_database_backend(edit_mode, df):
     st.title("⚙️ Database Management")
     
     if edit_mode:
@@ -1094,11 +1978,38 @@ def display_database_backend(edit_mode):
                     logger.error(f"Error clearing database: {e}")
                     st.error(f"Error clearing database: {e}")
 
+        # Bulk CSV Import
+        display_csv_import()
+
         # Recent Entries Management
         display_recent_entries_management()
 
     # Database Statistics
-    display_database_statistics()
+    display_database_statistics(df)
+
+@st.fragment
+@monitor_performance
+def display_csv_import():
+    st.subheader("📥 Bulk CSV Import")
+    st.markdown("Append the rows of a CSV file whose headers match the database columns.")
+    
+    uploaded = st.file_uploader("Upload CSV", type="csv")
+    if uploaded is not None and st.button("Import Rows"):
+        try:
+            csv_df = pd.read_csv(uploaded, engine='pyarrow')
+            cols = [c for c in INSERT_COLS if c in csv_df.columns]
+            if not cols:
+                st.error("The file has none of the database columns")
+                return
+            # All rows go through insert_entries: one executemany in one transaction
+            rows = [dict(zip(cols, row)) for row in _to_db_rows(csv_df, cols)]
+            if insert_entries(rows):
+                st.success(f"Imported {len(rows)} rows")
+        except Exception as e:
+            logger.error(f"CSV import error: {e}")
+            st.error(f"Error importing CSV: {e}")
+
+BACKUP_PAGES = 200
 
 @monitor_performance
 def backup_database():
@@ -1109,12 +2020,21 @@ def backup_database():
     # Ensure backup directory exists
     os.makedirs("backups", exist_ok=True)
     
+    bar = st.progress(0.0, text="Backing up database...")
+
+    def progress(status, remaining, total):
+        bar.progress(1 - remaining / total if total else 1.0)
+        # Let other sessions' threads run between page batches
+        time.sleep(0)
+
     try:
+        # The write lock keeps other sessions from restarting the copy midway
         with get_db_connection() as conn:
-            # Create backup
             backup_conn = sqlite3.connect(backup_path)
-            conn.backup(backup_conn)
-            backup_conn.close()
+            try:
+                conn.backup(backup_conn, pages=BACKUP_PAGES, progress=progress)
+            finally:
+                backup_conn.close()
         return True
     except Exception as e:
         logger.error(f"Backup error: {e}")
@@ -1128,17 +2048,95 @@ def clear_database():
             cursor = conn.cursor()
             cursor.execute(f"DELETE FROM {TABLE_NAME}")
             conn.commit()
+        invalidate_data_caches()
         return True
     except Exception as e:
         logger.error(f"Database clear error: {e}")
         raise
 
+@lru_cache(maxsize=8)
+def _upsert_sql(cols: tuple[str, ...]) -> str:
+    """Upsert statement for a column set, built once so SQLite reuses the prepared statement"""
+    # ON CONFLICT ... DO UPDATE keeps the row, so the search index update trigger fires
+    updates = ', '.join(f"{c} = excluded.{c}" for c in cols[1:])
+    return (
+        f"INSERT INTO {TABLE_NAME} ({', '.join(cols)}) "
+        f"VALUES ({', '.join('?' * len(cols))}) "
+        f"ON CONFLICT(id) DO UPDATE SET {updates}"
+    )
+
+def _to_db_rows(df: pd.DataFrame, cols) -> list[tuple]:
+    """Frame rows as tuples of values the sqlite3 driver can bind"""
+    def to_db_value(value):
+        if pd.isna(value):
+            return None
+        if isinstance(value, pd.Timestamp):
+            return value.strftime("%Y-%m-%d %H:%M:%S")
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    return [
+        tuple(to_db_value(value) for value in row)
+        for row in df[list(cols)].astype(object).itertuples(index=False, name=None)
+    ]
+
 @monitor_performance
-def update_database_entries(df):
-    """Update database entries with edited dataframe"""
+def update_database_entries(df, original_df=None, rewrite_all=False):
+    """Write edited rows back; only rows that differ from original_df are upserted"""
     try:
+        if 'id' not in df.columns:
+            if not rewrite_all:
+                raise ValueError("Edited data has no id column to match rows on")
+            # Without ids every row is new and everything already stored is replaced
+            df = df.assign(id=None)
+
+        cols = tuple(c for c in UPSERT_COLS if c in df.columns)
+        rows = _to_db_rows(df, cols)
+        kept_ids = {row[0] for row in rows if row[0] is not None}
+        if not rewrite_all and original_df is not None and 'id' in original_df.columns:
+            original = {row[0]: row for row in _to_db_rows(original_df, cols)}
+            rows = [row for row in rows if original.get(row[0]) != row]
+
+        query = _upsert_sql(cols)
+        existing = [row for row in rows if row[0] is not None]
+        new_rows = [dict(zip(cols[1:], row[1:])) for row in rows if row[0] is None]
+
+        # Rows added in the editor are checked like insert_entries checks its rows;
+        # if any is rejected nothing is written, so the edits can be corrected and saved again
+        rejected = []
+        for position, data in enumerate(new_rows, start=1):
+            is_valid, error_message = validate_entry_data(data)
+            if not is_valid:
+                rejected.append(f"new row {position}: {error_message}")
+        if rejected:
+            st.error("Validation error, nothing was saved: " + "; ".join(rejected))
+            return False
+        # Rows are deleted, upserted and inserted in place, so the table keeps its
+        # primary key, indexes and the triggers behind the search and tag tables
         with get_db_connection() as conn:
-            df.to_sql(TABLE_NAME, conn, if_exists='replace', index=False)
+            if rewrite_all:
+                # Every stored entry missing from the edited rows goes
+                stored_ids = {row[0] for row in conn.execute(f"SELECT id FROM {TABLE_NAME}")}
+                deleted_ids = stored_ids - kept_ids
+            elif original_df is not None and 'id' in original_df.columns:
+                # Rows removed in the editor
+                deleted_ids = set(original_df['id'].dropna().astype(int)) - kept_ids
+            else:
+                deleted_ids = set()
+            if not rows and not deleted_ids:
+                return True
+
+            conn.executemany(
+                f"DELETE FROM {TABLE_NAME} WHERE id = ?", [(int(i),) for i in deleted_ids]
+            )
+            conn.executemany(query, existing)
+            if any(col in TAG_CATEGORIES for col in cols):
+                _insert_tags(conn, [row[0] for row in existing],
+                             [dict(zip(cols, row)) for row in existing])
+            if new_rows:
+                _insert_rows(conn, new_rows)
+        invalidate_data_caches()
         return True
     except Exception as e:
         logger.error(f"Database update error: {e}")
@@ -1147,98 +2145,45 @@ def update_database_entries(df):
 @monitor_performance
 def prepare_df_for_display(df):
     """Convert DataFrame to display-friendly format"""
-    display_df = df.copy()
+    # Shallow copy: only the timestamp columns are replaced, the rest share memory
+    display_df = df.copy(deep=False)
     
     # Convert timestamps to strings
-    datetime_columns = display_df.select_dtypes(include=['datetime64']).columns
-    for col in datetime_columns:
-        display_df[col] = display_df[col].dt.strftime("%Y-%m-%d %H:%M:%S")
-    
-    # Convert other types to basic Python types
     for col in display_df.columns:
-        if display_df[col].dtype == 'object':
-            display_df[col] = display_df[col].astype(str)
-        elif display_df[col].dtype in ['int64', 'float64']:
-            display_df[col] = display_df[col].astype(float)
+        if pd.api.types.is_datetime64_any_dtype(display_df[col]):
+            display_df[col] = display_df[col].dt.strftime("%Y-%m-%d %H:%M:%S")
     
     return display_df
 
 
 @monitor_performance
-def display_database_statistics():
-    st.header("📊 Database Statistics")
-    
-    try:
-        df = load_data()
-        if not df.empty:
-            col1, col2 = st.columns(2)
-            with col1:
-                st.metric("Total Records", len(df))
-                if 'Healthcare_Role' in df.columns:
-                    st.metric("Unique Healthcare Roles", 
-                             len(df['Healthcare_Role'].unique()))
-            with col2:
-                st.metric("Data Points", len(df.columns) * len(df))
-                if 'Observation_Date' in df.columns:
-                    last_update = df['Observation_Date'].max()
-                    if isinstance(last_update, pd.Timestamp):
-                        last_update = last_update.strftime("%Y-%m-%d %H:%M:%S")
-                    st.metric("Last Update", last_update)
-                else:
-                    st.metric("Last Update", "N/A")
-
-            # Data Quality Check
-            display_data_quality_check(df)
-
-            # Database Documentation
-            display_database_documentation()
-        else:
-            st.info("No data available in the database")
-    except Exception as e:
-        logger.error(f"Error displaying database statistics: {e}")
-        st.error("Error loading database statistics")
-
-
-@monitor_performance
-def display_data_quality_check(df):
+def display_data_quality_check(summary, version):
     st.subheader("🔍 Data Quality Check")
     
     try:
-        # Missing data analysis
-        missing_data = df.isnull().sum()
-        missing_pct = (missing_data / len(df) * 100).round(2)
-        
-        # Create DataFrame for display
-        quality_info = []
-        for column in df.columns:
-            quality_info.append({
-                'Column': str(column),
-                'Data Type': str(df[column].dtype),
-                'Unique Values': int(df[column].nunique()),
-                'Missing Values': int(df[column].isnull().sum()),
-                'Missing %': f"{(df[column].isnull().sum() / len(df) * 100):.2f}%"
-            })
-        
-        # Convert to DataFrame and ensure all columns are strings
-        quality_df = pd.DataFrame(quality_info)
-        for col in quality_df.columns:
-            quality_df[col] = quality_df[col].astype(str)
+        # Missing and distinct counts come from one aggregate query
+        quality_df = get_column_stats(version)
+        rows = summary['rows']
+        quality_df['Missing %'] = [
+            f"{(missing / rows * 100 if rows else 0):.2f}%"
+            for missing in quality_df['Missing Values']
+        ]
         
         # Display summary statistics
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Total Columns", str(len(df.columns)))
+            st.metric("Total Columns", str(summary['columns']))
         with col2:
-            st.metric("Total Rows", str(len(df)))
+            st.metric("Total Rows", str(rows))
         with col3:
-            st.metric("Columns with Missing Data", str(sum(missing_data > 0)))
+            st.metric("Columns with Missing Data", str(int((quality_df['Missing Values'] > 0).sum())))
         
         # Display detailed quality information
         st.write("### Detailed Column Information")
         st.dataframe(quality_df)
         
         # Display columns with missing data
-        missing_cols = quality_df[quality_df['Missing Values'].astype(str) != '0']
+        missing_cols = quality_df[quality_df['Missing Values'] > 0]
         if not missing_cols.empty:
             st.write("### Columns with Missing Data")
             st.dataframe(missing_cols)
@@ -1250,9 +2195,9 @@ def display_data_quality_check(df):
         st.error(f"Error displaying data quality metrics: {str(e)}")
 
 @monitor_performance
-def display_filtered_results(filtered_df, df):
+def display_filtered_results(filtered_df, total_rows):
     try:
-        st.markdown(f"**Showing {len(filtered_df)} of {len(df)} records**")
+        st.markdown(f"**Showing {len(filtered_df)} of {total_rows} records**")
         
         # Column selection
         st.subheader("📋 Select Columns to Display")
@@ -1269,22 +2214,17 @@ def display_filtered_results(filtered_df, df):
         )
         
         if selected_columns:
-            # Convert DataFrame to display-friendly format
-            display_df = filtered_df[selected_columns].copy()
-            
-            # Convert all columns to strings for safe display
-            for col in display_df.columns:
-                if pd.api.types.is_datetime64_any_dtype(display_df[col]):
-                    display_df[col] = display_df[col].dt.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    display_df[col] = display_df[col].astype(str)
+            # Only the visible window is formatted; Arrow renders the other dtypes as they are
+            display_df = prepare_df_for_display(filtered_df[selected_columns].iloc[:DISPLAY_ROW_LIMIT])
             
             # Display as a static table
             st.dataframe(display_df)
+            if len(filtered_df) > DISPLAY_ROW_LIMIT:
+                st.caption(f"Showing the first {DISPLAY_ROW_LIMIT} rows; the export includes all of them.")
             
             # Export options
-            if len(display_df) > 0:
-                export_data(display_df, selected_columns)
+            if len(filtered_df) > 0:
+                export_data(filtered_df[selected_columns], selected_columns)
         else:
             st.warning("Please select at least one column to display")
         
@@ -1292,6 +2232,7 @@ def display_filtered_results(filtered_df, df):
         logger.error(f"Error displaying filtered results: {e}")
         st.error(f"Error displaying results: {str(e)}")
 
+@st.fragment
 @monitor_performance
 def export_data(df, selected_columns):
     try:
@@ -1304,28 +2245,21 @@ def export_data(df, selected_columns):
         
         if st.button("Export Data"):
             try:
-                # Create a copy for export
-                export_df = df.copy()
+                ok, payload = safe_export_data(df, export_format)
+                if not ok:
+                    raise ValueError(payload)
                 
                 if export_format == "CSV":
-                    # Convert to CSV
-                    csv_data = export_df.to_csv(index=False)
                     st.download_button(
                         label="Download CSV",
-                        data=csv_data,
+                        data=payload,
                         file_name="resume_data_export.csv",
                         mime="text/csv"
                     )
                 else:  # Excel
-                    # Convert to Excel
-                    buffer = io.BytesIO()
-                    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-                        export_df.to_excel(writer, index=False)
-                    buffer.seek(0)
-                    
                     st.download_button(
                         label="Download Excel",
-                        data=buffer,
+                        data=payload,
                         file_name="resume_data_export.xlsx",
                         mime="application/vnd.ms-excel"
                     )
@@ -1341,6 +2275,24 @@ def export_data(df, selected_columns):
         st.error("Error setting up export. Please try again.")
 
  
+def _editor_column_config(df: pd.DataFrame) -> dict:
+    """Typed editor columns, so cells travel as Arrow values rather than strings"""
+    config = {}
+    for col in df.columns:
+        if col == 'id':
+            # Assigned by SQLite; new rows get theirs on save
+            config[col] = st.column_config.NumberColumn(disabled=True)
+        elif pd.api.types.is_bool_dtype(df[col]):
+            config[col] = st.column_config.CheckboxColumn()
+        elif pd.api.types.is_numeric_dtype(df[col]):
+            config[col] = st.column_config.NumberColumn()
+        elif pd.api.types.is_datetime64_any_dtype(df[col]):
+            config[col] = st.column_config.DatetimeColumn()
+        else:
+            config[col] = st.column_config.TextColumn()
+    return config
+
+@st.fragment
 @monitor_performance
 def display_recent_entries_management():
     st.subheader("📝 Recent Entries Management")
@@ -1348,24 +2300,24 @@ def display_recent_entries_management():
     
     try:
         recent_data = get_latest_entries(20)
-        def get_latest_entries(limit: int) -> pd.DataFrame:
-            """Fetch the latest entries from the database."""
-            try:
-                with get_db_connection() as conn:
-                    query = f"SELECT * FROM {TABLE_NAME} ORDER BY Observation_Date DESC LIMIT ?"
-                    df = pd.read_sql_query(query, conn, params=(limit,))
-                    return df
-            except Exception as e:
-                logger.error(f"Error fetching latest entries: {e}")
-                return pd.DataFrame()
         
         if not recent_data.empty:
-            edited_df = st.data_editor(recent_data)
+            edited_df = st.data_editor(
+                recent_data,
+                column_config=_editor_column_config(recent_data),
+                num_rows='dynamic',
+                key='recent_entries_editor'
+            )
+            rewrite_all = st.checkbox(
+                "Rewrite all: replace the whole table with the rows above",
+                value=False
+            )
             if st.button("Save Changes"):
                 try:
-                    update_database_entries(edited_df)
-                    st.success("Changes saved successfully!")
-                    st.rerun()
+                    # On a validation error the messages stay up and the edits are kept
+                    if update_database_entries(edited_df, recent_data, rewrite_all=rewrite_all):
+                        st.success("Changes saved successfully!")
+                        st.rerun()
                 except Exception as e:
                     logger.error(f"Error saving changes: {e}")
                     st.error(f"Error saving changes: {e}")
@@ -1376,12 +2328,10 @@ def display_recent_entries_management():
         st.error("Error loading recent entries")
 
 @monitor_performance
-def display_database_documentation():
+def display_database_documentation(df):
     st.header("📚 Database Documentation")
     
     try:
-        df = load_data()
-        
         # Display table structure
         st.markdown("""
         ### Table Structure
@@ -1397,18 +2347,13 @@ def display_database_documentation():
         if not df.empty:
             st.subheader("📊 Column Information")
             
-            column_info = []
-            for column in df.columns:
-                info = {
-                    'Column Name': str(column),
-                    'Data Type': str(df[column].dtype),
-                    'Non-Null Count': str(df[column].count()),
-                    'Unique Values': str(df[column].nunique())
-                }
-                column_info.append(info)
-            
-            # Create and display DataFrame
-            info_df = pd.DataFrame(column_info)
+            # One frame-wide pass per statistic instead of a loop over columns
+            info_df = pd.DataFrame({
+                'Column Name': df.columns.astype(str),
+                'Data Type': df.dtypes.astype(str).values,
+                'Non-Null Count': df.count().values,
+                'Unique Values': df.nunique(dropna=True).values
+            })
             st.dataframe(info_df)
         
         # Best practices section
@@ -1437,48 +2382,53 @@ def display_database_documentation():
         st.error("Error loading database documentation")
 
 @monitor_performance
-def display_database_statistics():
+def display_database_statistics(df):
     st.header("📊 Database Statistics")
     
     try:
-        df = load_data()
-        if not df.empty:
+        version = db_data_version()
+        summary = get_table_summary(version)
+        if summary['rows']:
             # Basic statistics
             col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("Total Records", str(len(df)))
+                st.metric("Total Records", str(summary['rows']))
             with col2:
-                st.metric("Total Columns", str(len(df.columns)))
+                st.metric("Total Columns", str(summary['columns']))
             with col3:
-                if 'Observation_Date' in df.columns:
-                    last_update = df['Observation_Date'].max()
-                    if isinstance(last_update, pd.Timestamp):
-                        last_update = last_update.strftime("%Y-%m-%d %H:%M:%S")
-                    st.metric("Last Update", str(last_update))
+                st.metric("Last Update", str(summary['last_update'] or "N/A"))
             
             # Data quality overview
             st.subheader("Data Quality Overview")
             
             # Calculate quality metrics
+            column_stats = get_column_stats(version)
+            metrics = {
+                'Missing Values': int(column_stats['Missing Values'].sum()),
+                'Complete Records': summary['complete_rows'],
+            }
+            # The duplicate scan compares whole rows, so it only runs on request
+            if st.checkbox("Also check duplicates", value=False):
+                metrics['Duplicate Records'] = count_duplicate_rows(version)
             quality_metrics = pd.DataFrame({
-                'Metric': ['Missing Values', 'Complete Records', 'Duplicate Records'],
-                'Count': [
-                    str(df.isnull().sum().sum()),
-                    str(df.dropna().shape[0]),
-                    str(df.duplicated().sum())
-                ]
+                'Metric': list(metrics),
+                'Count': [str(count) for count in metrics.values()]
             })
             
             st.dataframe(quality_metrics)
             
             # Column type distribution
             st.subheader("Column Type Distribution")
-            dtype_counts = df.dtypes.value_counts().reset_index()
+            dtype_counts = column_stats['Data Type'].value_counts().reset_index()
             dtype_counts.columns = ['Data Type', 'Count']
-            dtype_counts['Data Type'] = dtype_counts['Data Type'].astype(str)
-            dtype_counts['Count'] = dtype_counts['Count'].astype(str)
             
             st.dataframe(dtype_counts)
+
+            # Data Quality Check
+            display_data_quality_check(summary, version)
+
+            # Database Documentation reuses the frame main() already loaded
+            display_database_documentation(df)
             
         else:
             st.info("No data available in the database")
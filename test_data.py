@@ -1,13 +1,14 @@
 import pandas as pd
 import numpy as np
-import random
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import argparse
 from datetime import datetime, timedelta
+from numba import njit, prange
 
-# Set random seed for reproducibility
-np.random.seed(42)
-
-# Number of test records
-n_records = 500
+# Seed for the PCG64 generator, for reproducibility
+SEED = 42
 
 # Define all possible values for categorical variables
 healthcare_roles = ["Doctor", "Nurse", "Admin Staff", "Paramedic", "Technician", 
@@ -20,127 +21,199 @@ departments = ["Emergency", "Surgery", "Pediatrics", "Oncology", "Cardiology",
 mh_disorders_list = ["None", "Depression", "Anxiety", "Bipolar", "PTSD", 
                     "Depression, Anxiety", "Multiple"]
 
+# Repeated "None" entries weight the draw towards no disorder
 substance_disorders_list = ["None", "Alcohol", "Cannabis", "Prescription Drugs", 
                           "Multiple", "None", "None"]
 
 chronic_illnesses_list = ["None", "Diabetes", "Hypertension", "Asthma", 
                          "Multiple", "None", "None"]
 
-# Generate base data
-data = {
-    # Demographic & Socioeconomic
-    'Age': np.random.randint(22, 71, n_records),
-    'Sex': np.random.choice(['Male', 'Female', 'Other'], n_records, p=[0.45, 0.50, 0.05]),
-    'Employment_Status': np.random.choice(['Full-time', 'Part-time', 'Contract', 'Temporary'], n_records),
-    'Income_Level': np.random.choice(['Low', 'Medium', 'High'], n_records),
-    'Social_Deprivation': np.random.randint(0, 11, n_records),
-    'Material_Deprivation': np.random.randint(0, 11, n_records),
-
-    # Occupational Data (New Section)
-    'Healthcare_Role': np.random.choice(healthcare_roles, n_records),
-    'Department': np.random.choice(departments, n_records),
-    'Years_Experience': np.random.randint(0, 41, n_records),
-    'Weekly_Hours': np.random.randint(20, 61, n_records),
-    'Night_Shifts_Monthly': np.random.randint(0, 13, n_records),
-    'Overtime_Hours_Monthly': np.random.randint(0, 41, n_records),
-    'Patient_Facing': np.random.choice(['Yes', 'No'], n_records),
-    'Management_Responsibilities': np.random.choice(['Yes', 'No'], n_records),
-    'Work_Stress_Level': np.random.randint(0, 11, n_records),
-    'Job_Satisfaction': np.random.randint(0, 11, n_records),
-    'Workplace_Support': np.random.randint(0, 11, n_records),
-    'Burnout_Level': np.random.randint(0, 11, n_records),
-    'Sick_Days_Last_Year': np.random.randint(0, 31, n_records),
-    'Workplace_Incidents': np.random.randint(0, 6, n_records),
-    'Recent_Promotion': np.random.choice(['Yes', 'No'], n_records, p=[0.2, 0.8]),
-    'Recent_Demotion': np.random.choice(['Yes', 'No'], n_records, p=[0.05, 0.95]),
-
-    # Clinical & Psychiatric
-    'MH_Disorders': [random.choice(mh_disorders_list) for _ in range(n_records)],
-    'Substance_Use_Disorders': [random.choice(substance_disorders_list) for _ in range(n_records)],
-    'History_Suicidal_Ideation': np.random.choice([0, 1], n_records, p=[0.8, 0.2]),
-    'Previous_Suicide_Attempts': np.random.choice([0, 1, 2, 3], n_records, p=[0.85, 0.1, 0.03, 0.02]),
-    'Frequency_Suicidal_Thoughts': np.random.randint(0, 11, n_records),
-    'Intensity_Suicidal_Thoughts': np.random.randint(0, 11, n_records),
-
-    # Health & Medical
-    'Chronic_Illnesses': [random.choice(chronic_illnesses_list) for _ in range(n_records)],
-    'GP_Visits': np.random.randint(0, 21, n_records),
-    'ED_Visits': np.random.randint(0, 11, n_records),
-    'Hospitalizations': np.random.randint(0, 6, n_records),
-
-    # Psychological Factors
-    'Hopelessness': np.random.randint(0, 11, n_records),
-    'Despair': np.random.randint(0, 11, n_records),
-    'Impulsivity': np.random.randint(0, 11, n_records),
-    'Aggression': np.random.randint(0, 11, n_records),
-    'Access_Lethal_Means': np.random.randint(0, 11, n_records),
-    'Social_Isolation': np.random.randint(0, 11, n_records),
-
-    # Support & Resilience
-    'Coping_Strategies': np.random.randint(0, 11, n_records),
-    'Measured_Resilience': np.random.randint(0, 11, n_records),
-    'MH_Service_Engagement': np.random.randint(0, 11, n_records),
-    'Supportive_Relationships': np.random.randint(0, 11, n_records),
+# Columns that share an inclusive value range are drawn together, one matrix row per column
+shared_ranges = {
+    (0, 10): [
+        'Social_Deprivation', 'Material_Deprivation', 'Work_Stress_Level',
+        'Job_Satisfaction', 'Workplace_Support', 'Burnout_Level',
+        'Frequency_Suicidal_Thoughts', 'Intensity_Suicidal_Thoughts', 'ED_Visits',
+        'Hopelessness', 'Despair', 'Impulsivity', 'Aggression',
+        'Access_Lethal_Means', 'Social_Isolation', 'Coping_Strategies',
+        'Measured_Resilience', 'MH_Service_Engagement', 'Supportive_Relationships'
+    ],
+    (0, 40): ['Years_Experience', 'Overtime_Hours_Monthly'],
+    (0, 5): ['Workplace_Incidents', 'Hospitalizations'],
 }
 
-# Create DataFrame
-df = pd.DataFrame(data)
-
-# Add correlated and derived fields
-# Correlate burnout with work stress and overtime
-df['Burnout_Level'] = np.clip(
-    df['Work_Stress_Level'] * 0.4 + 
-    df['Overtime_Hours_Monthly'] * 0.1 + 
-    np.random.normal(0, 1, n_records),
-    0, 10
-).astype(int)
-
-# Correlate job satisfaction inversely with burnout
-df['Job_Satisfaction'] = np.clip(
-    10 - df['Burnout_Level'] * 0.7 + 
-    np.random.normal(0, 1, n_records),
-    0, 10
-).astype(int)
-
-# Calculate Suicidal_Distress as weighted average of risk factors
-df['Suicidal_Distress'] = np.clip(
-    0.2 * df['Hopelessness'] +
-    0.2 * df['Despair'] +
-    0.15 * df['Social_Isolation'] +
-    0.15 * df['Burnout_Level'] +
-    0.1 * df['Work_Stress_Level'] +
-    0.1 * df['Access_Lethal_Means'] -
-    0.1 * df['Supportive_Relationships'] -
-    0.1 * df['Job_Satisfaction'] +
-    np.random.normal(0, 1, n_records),
-    0, 10
-).astype(int)
-
-# Calculate Time_To_Crisis (days) - higher risk scores have shorter times
-df['Time_To_Crisis'] = np.clip(
-    365 * (1 - df['Suicidal_Distress']/15) + 
-    np.random.normal(0, 30, n_records),
-    7, 365
-).astype(int)
-
-# Crisis event (more likely with higher distress)
-crisis_prob = df['Suicidal_Distress'] / 15
-df['Crisis_Event'] = np.random.binomial(1, crisis_prob)
-
-# Generate observation dates (within the last year)
-end_date = datetime.now()
-start_date = end_date - timedelta(days=365)
-random_days = np.random.randint(0, 365, n_records)
-df['Observation_Date'] = [(start_date + timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S") 
-                         for days in random_days]
-
-# Save to CSV
-df.to_csv('resume_test_data_full.csv', index=False)
-print("Test data CSV created successfully with", n_records, "records!")
-
-# Display some basic statistics
-print("\nBasic Statistics:")
-print(f"Total Records: {len(df)}")
-print(f"Crisis Events: {df['Crisis_Event'].sum()}")
-print(f"Average Burnout Level: {df['Burnout_Level'].mean():.2f}")
-print(f"Average Suicidal Distress: {df['Suicidal_Distress'].mean():.2f}")
+# Uniform categorical draws produce int8 codes directly; repeated options weight the draw
+def draw_categorical(rng, options, n_records):
+    categories = list(dict.fromkeys(options))
+    code_of_option = np.array([categories.index(option) for option in options], dtype=np.int8)
+    picks = rng.integers(0, len(options), n_records, dtype=np.int8)
+    return pd.Categorical.from_codes(code_of_option[picks], categories)
+
+# Weighted draw of the codes 0..len(p)-1 by inverting the cumulative distribution
+def draw_weighted_codes(rng, p, n_records):
+    cdf = np.cumsum(p)
+    cdf[-1] = 1.0  # guard against the sum rounding just below 1
+    return np.searchsorted(cdf, rng.random(n_records), side='right').astype(np.int8)
+
+# Yes with probability p_yes: a uniform below p_yes becomes code 1 of ['No', 'Yes']
+def draw_yes_no(rng, p_yes, n_records):
+    codes = np.less(rng.random(n_records), p_yes, out=np.empty(n_records, dtype=np.int8))
+    return pd.Categorical.from_codes(codes, ['No', 'Yes'])
+
+@njit(parallel=True, fastmath=True, cache=True)
+def clipped_weighted_sum(columns, weights, offset, noise, noise_scale, low, high, out):
+    # Weighted sum, noise, clip and integer cast in a single pass per row
+    for i in prange(out.shape[0]):
+        value = offset + noise_scale * noise[i]
+        for k in range(len(columns)):
+            value += weights[k] * columns[k][i]
+        out[i] = low if value < low else (high if value > high else int(value))
+    return out
+
+def derived_score(rng, data, names, weights, offset=0.0, noise_scale=1.0,
+                  low=0, high=10, dtype=np.int8):
+    n_records = len(data[names[0]])
+    return clipped_weighted_sum(
+        tuple(data[name] for name in names), np.array(weights), offset,
+        rng.standard_normal(n_records), noise_scale, low, high,
+        np.empty(n_records, dtype=dtype)
+    )
+
+def to_arrow(values):
+    if isinstance(values, pd.Categorical):
+        return pa.DictionaryArray.from_arrays(values.codes, values.categories.tolist())
+    return pa.array(values)
+
+def main(n_records=500, out='resume_test_data_full'):
+    """Generate n_records synthetic entries and write them to <out>.csv and <out>.parquet"""
+    rng = np.random.default_rng(SEED)
+
+    shared = {}
+    for (low, high), columns in shared_ranges.items():
+        draws = rng.integers(low, high, size=(len(columns), n_records), endpoint=True, dtype=np.int8)
+        shared.update(zip(columns, draws))
+
+    # Generate base data
+    data = {
+        # Demographic & Socioeconomic
+        'Age': rng.integers(22, 70, n_records, endpoint=True, dtype=np.int8),
+        'Sex': pd.Categorical.from_codes(
+            draw_weighted_codes(rng, [0.45, 0.50, 0.05], n_records), ['Male', 'Female', 'Other']
+        ),
+        'Employment_Status': draw_categorical(rng, ['Full-time', 'Part-time', 'Contract', 'Temporary'], n_records),
+        'Income_Level': draw_categorical(rng, ['Low', 'Medium', 'High'], n_records),
+        'Social_Deprivation': shared['Social_Deprivation'],
+        'Material_Deprivation': shared['Material_Deprivation'],
+
+        # Occupational Data (New Section)
+        'Healthcare_Role': draw_categorical(rng, healthcare_roles, n_records),
+        'Department': draw_categorical(rng, departments, n_records),
+        'Years_Experience': shared['Years_Experience'],
+        'Weekly_Hours': rng.integers(20, 60, n_records, endpoint=True, dtype=np.int8),
+        'Night_Shifts_Monthly': rng.integers(0, 12, n_records, endpoint=True, dtype=np.int8),
+        'Overtime_Hours_Monthly': shared['Overtime_Hours_Monthly'],
+        'Patient_Facing': draw_yes_no(rng, 0.5, n_records),
+        'Management_Responsibilities': draw_yes_no(rng, 0.5, n_records),
+        'Work_Stress_Level': shared['Work_Stress_Level'],
+        'Job_Satisfaction': shared['Job_Satisfaction'],
+        'Workplace_Support': shared['Workplace_Support'],
+        'Burnout_Level': shared['Burnout_Level'],
+        'Sick_Days_Last_Year': rng.integers(0, 30, n_records, endpoint=True, dtype=np.int8),
+        'Workplace_Incidents': shared['Workplace_Incidents'],
+        'Recent_Promotion': draw_yes_no(rng, 0.2, n_records),
+        'Recent_Demotion': draw_yes_no(rng, 0.05, n_records),
+
+        # Clinical & Psychiatric
+        'MH_Disorders': draw_categorical(rng, mh_disorders_list, n_records),
+        'Substance_Use_Disorders': draw_categorical(rng, substance_disorders_list, n_records),
+        'History_Suicidal_Ideation': draw_weighted_codes(rng, [0.8, 0.2], n_records),
+        # The codes are the attempt counts themselves
+        'Previous_Suicide_Attempts': draw_weighted_codes(rng, [0.85, 0.1, 0.03, 0.02], n_records),
+        'Frequency_Suicidal_Thoughts': shared['Frequency_Suicidal_Thoughts'],
+        'Intensity_Suicidal_Thoughts': shared['Intensity_Suicidal_Thoughts'],
+
+        # Health & Medical
+        'Chronic_Illnesses': draw_categorical(rng, chronic_illnesses_list, n_records),
+        'GP_Visits': rng.integers(0, 20, n_records, endpoint=True, dtype=np.int8),
+        'ED_Visits': shared['ED_Visits'],
+        'Hospitalizations': shared['Hospitalizations'],
+
+        # Psychological Factors
+        'Hopelessness': shared['Hopelessness'],
+        'Despair': shared['Despair'],
+        'Impulsivity': shared['Impulsivity'],
+        'Aggression': shared['Aggression'],
+        'Access_Lethal_Means': shared['Access_Lethal_Means'],
+        'Social_Isolation': shared['Social_Isolation'],
+
+        # Support & Resilience
+        'Coping_Strategies': shared['Coping_Strategies'],
+        'Measured_Resilience': shared['Measured_Resilience'],
+        'MH_Service_Engagement': shared['MH_Service_Engagement'],
+        'Supportive_Relationships': shared['Supportive_Relationships'],
+    }
+
+    # Add correlated and derived fields to the same dict, so the DataFrame is built once
+    # Correlate burnout with work stress and overtime
+    data['Burnout_Level'] = derived_score(
+        rng, data, ['Work_Stress_Level', 'Overtime_Hours_Monthly'], [0.4, 0.1]
+    )
+
+    # Correlate job satisfaction inversely with burnout
+    data['Job_Satisfaction'] = derived_score(rng, data, ['Burnout_Level'], [-0.7], offset=10.0)
+
+    # Calculate Suicidal_Distress as weighted average of risk factors
+    data['Suicidal_Distress'] = derived_score(
+        rng, data,
+        ['Hopelessness', 'Despair', 'Social_Isolation', 'Burnout_Level', 'Work_Stress_Level',
+         'Access_Lethal_Means', 'Supportive_Relationships', 'Job_Satisfaction'],
+        [0.2, 0.2, 0.15, 0.15, 0.1, 0.1, -0.1, -0.1]
+    )
+
+    # Calculate Time_To_Crisis (days) - higher risk scores have shorter times:
+    # 365 * (1 - Suicidal_Distress / 15) expanded into offset and weight
+    data['Time_To_Crisis'] = derived_score(
+        rng, data, ['Suicidal_Distress'], [-365 / 15], offset=365.0, noise_scale=30.0,
+        low=7, high=365, dtype=np.int16
+    )
+
+    # Crisis event (more likely with higher distress): with U uniform on 0..14,
+    # P(U < Suicidal_Distress) is exactly Suicidal_Distress / 15, so no float probabilities are needed
+    # The comparison writes its result straight into the int8 column
+    data['Crisis_Event'] = np.less(
+        rng.integers(0, 14, n_records, endpoint=True, dtype=np.int8), data['Suicidal_Distress'],
+        out=np.empty(n_records, dtype=np.int8)
+    )
+
+    # Generate observation dates (within the last year)
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=365)
+    random_days = rng.integers(0, 364, n_records, endpoint=True)
+    # Whole seconds, so the CSV reads "YYYY-MM-DD HH:MM:SS"; Parquet keeps a timestamp
+    data['Observation_Date'] = (
+        np.datetime64(start_date.replace(microsecond=0), 's') + random_days.astype('timedelta64[D]')
+    )
+
+    # Build the Arrow table straight from the arrays, without an intermediate DataFrame;
+    # numeric columns are wrapped without copying and categoricals become dictionary arrays
+    table = pa.Table.from_arrays([to_arrow(values) for values in data.values()], names=list(data))
+
+    # Save to CSV (read by the app's bulk import) and to Parquet
+    pa_csv.write_csv(table, f'{out}.csv')
+    pq.write_table(table, f'{out}.parquet', compression='snappy')
+    print("Test data CSV and Parquet created successfully with", n_records, "records!")
+
+    # Display some basic statistics
+    print("\nBasic Statistics:")
+    print(f"Total Records: {table.num_rows}")
+    print(f"Crisis Events: {data['Crisis_Event'].sum()}")
+    print(f"Average Burnout Level: {data['Burnout_Level'].mean():.2f}")
+    print(f"Average Suicidal Distress: {data['Suicidal_Distress'].mean():.2f}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate synthetic RESUME test data")
+    parser.add_argument('--rows', type=int, default=500, help="number of records to generate")
+    parser.add_argument('--out', default='resume_test_data_full',
+                        help="output path without extension; .csv and .parquet are written")
+    args = parser.parse_args()
+    main(args.rows, args.out)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The app is a single script at the repo root, not an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+
+import app
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_CSV = os.path.join(REPO_ROOT, 'resume_test_data_full.csv')
+FEATURE_COLS = ['Age', 'Work_Stress_Level', 'Burnout_Level',
+                'Social_Isolation', 'Hopelessness', 'Despair']
+
+
+@pytest.fixture(scope='module')
+def crisis_split():
+    """Train/test split of the sample data, prepared as display_ml_analysis does"""
+    df = pd.read_csv(SAMPLE_CSV)
+    X_raw = np.ascontiguousarray(df[FEATURE_COLS].to_numpy(np.float32))
+    col_means = np.nanmean(X_raw, axis=0).astype(np.float32)
+    weights = np.array(
+        [app.RISK_COMPOSITE_WEIGHTS.get(col, 0.0) for col in FEATURE_COLS],
+        dtype=np.float32
+    )
+    X = app._impute_and_score(X_raw, col_means, weights)
+    y = df['Crisis_Event'].to_numpy(np.float32)
+    return train_test_split(X, y, test_size=0.2, random_state=42)
+
+
+def test_fit_xgb_keeps_more_than_one_tree(crisis_split):
+    X_train, _, y_train, _ = crisis_split
+    booster = app._fit_xgb(X_train, y_train, tuple(FEATURE_COLS + ['Risk_Composite']))
+    assert booster.num_boosted_rounds() >= app.XGB_MIN_BOOST_ROUND
+    assert len(booster.get_dump()) > 1
+
+
+def test_fit_xgb_auc_not_below_default_classifier(crisis_split):
+    X_train, X_test, y_train, y_test = crisis_split
+    feature_cols = FEATURE_COLS + ['Risk_Composite']
+    booster = app._fit_xgb(X_train, y_train, tuple(feature_cols))
+    auc = roc_auc_score(
+        y_test, booster.predict(xgb.DMatrix(X_test, feature_names=feature_cols))
+    )
+
+    # The sklearn-wrapper model the ML tab used before the native booster
+    baseline = xgb.XGBClassifier(random_state=42).fit(X_train, y_train)
+    baseline_auc = roc_auc_score(y_test, baseline.predict_proba(X_test)[:, 1])
+
+    assert auc >= baseline_auc - 0.02
+
+
+def test_csv_export_truncates_sub_second_timestamps():
+    df = pd.DataFrame({
+        'Observation_Date': pd.to_datetime(['2025-03-26 14:05:09.123456']),
+        'Age': [34],
+    })
+    lines = app._csv_bytes(df).decode().splitlines()
+    assert lines[0] == '"Observation_Date","Age"'
+    assert lines[1].startswith('2025-03-26 14:05:09,')
+    assert '.123' not in lines[1]